@@ -0,0 +1,113 @@
+import hashlib
+import json
+import os
+import time
+from typing import AnyStr
+
+from JsonManifest import JsonManifest
+
+
+class ArtCache(JsonManifest):
+    """Content-addressed store of processed art, keyed by source image hash, processing parameters and pipeline version."""
+    _manifest_name = "manifest.json"
+    # Manifest writes are batched, access times and new entries only reach disk every so many changes and at exit
+    _save_every = 64
+    _validators_name = "validators.json"
+
+    def __init__(self, cache_dir: AnyStr = "./_cache/art", max_bytes: int = 2 * 1024 ** 3) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        super().__init__(os.path.join(cache_dir, self._manifest_name), self._save_every)
+        # HTTP validators of downloaded art, kept apart from the Scryfall cache so clearing either leaves the other be
+        self.validators = ArtValidators(os.path.join(cache_dir, self._validators_name), self._save_every)
+        self._bytes = sum(entry["bytes"] for entry in self._manifest.values())
+
+    # ---- Keys ---- #
+    @staticmethod
+    def hash_file(file_name: AnyStr, chunk_size: int = 1 << 20) -> str:
+        file_hash = hashlib.sha256()
+        with open(file_name, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
+
+    @staticmethod
+    def key(source_hash: str, params: dict, version: int | str) -> str:
+        signature = json.dumps({"source": source_hash, "params": params, "version": version}, sort_keys=True)
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, ext: str = ".png") -> str:
+        target_dir = os.path.join(self.cache_dir, key[:2])
+        os.makedirs(target_dir, exist_ok=True)
+        return os.path.join(target_dir, f"{key}{ext}")
+
+    # ---- Entries ---- #
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._manifest.get(key)
+            if entry is None:
+                return None
+            path = os.path.join(self.cache_dir, entry["file"])
+            if not os.path.exists(path):
+                self._bytes -= self._manifest.pop(key)["bytes"]
+                self._changed()
+                return None
+            entry["accessed"] = time.time()
+            self._changed()
+            return path
+
+    def put(self, key: str, path: AnyStr, source: AnyStr, params: dict, timings: dict) -> str:
+        now = time.time()
+        size = os.path.getsize(path)
+        with self._lock:
+            previous = self._manifest.get(key)
+            self._bytes += size - (previous["bytes"] if previous else 0)
+            self._manifest[key] = {
+                "file": os.path.relpath(path, self.cache_dir),
+                "source": str(source),
+                "params": params,
+                "bytes": size,
+                "created": now,
+                "accessed": now,
+                "timings": timings,
+            }
+            self._evict(keep=key)
+            self._changed()
+        return path
+
+    def _evict(self, keep: str = None) -> None:
+        if self._bytes <= self.max_bytes:
+            return None
+        for key, entry in sorted(self._manifest.items(), key=lambda e: e[1]["accessed"]):
+            if self._bytes <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except FileNotFoundError:
+                pass
+            self._bytes -= entry["bytes"]
+            del self._manifest[key]
+        return None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"items": len(self._manifest), "bytes": self._bytes}
+
+
+class ArtValidators(JsonManifest):
+    """ETag / Last-Modified of every art download, keyed on the art URL."""
+
+    def get(self, url: str) -> dict:
+        with self._lock:
+            return dict(self._manifest.get(url, {"etag": None, "last_modified": None}))
+
+    def set(self, url: str, etag: str = None, last_modified: str = None) -> None:
+        with self._lock:
+            if etag or last_modified:
+                self._manifest[url] = {"etag": etag, "last_modified": last_modified}
+            else:
+                self._manifest.pop(url, None)
+            self._changed()
@@ -0,0 +1,136 @@
+import atexit
+import threading
+import time
+
+from CacheStorage import CacheStorage
+from ScryfallCache import ScryfallCache
+
+DAY = 24 * 60 * 60
+
+
+class CachePolicy:
+    """Expiry and size limits for cached Scryfall responses: per-type TTLs, stale revalidation and LRU eviction."""
+    # Seconds a response stays fresh before it is revalidated, None never goes stale
+    default_ttls = {"card": 7 * DAY, "list": DAY, "mana_cost": None, "error": 60 * 60}
+    default_ttl = DAY
+    _touch_batch = 256
+    # Eviction frees down to this share of max_bytes, so it doesn't run again on the very next put
+    low_water = 0.9
+
+    def __init__(self, storage: CacheStorage, index: ScryfallCache, ttls: dict = None,
+                 max_bytes: int = 1024 ** 3) -> None:
+        self.storage = storage
+        self.index = index
+        self.ttls = {**self.default_ttls, **(ttls if ttls else {})}
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._accessed = {}
+        # Access times from cache hits are written in batches rather than once per hit. Pool processes skip
+        # atexit handlers, callers flush at the end of every batch and this only covers the main process
+        atexit.register(self.flush)
+
+    # ---- Entries ---- #
+    def get(self, uri_hash: str) -> tuple[dict | None, bool]:
+        # The cached response (or None) and whether it is past its TTL
+        content = self.storage.get(uri_hash)
+        if content is None:
+            return None, False
+        now = time.time()
+        entry = self.index.entry(uri_hash)
+        if entry is None or entry["backend"] != self.storage.backend:
+            # Cached before entries were tracked (or by another backend), its age is unknown so it starts out fresh
+            self._track(uri_hash, content.get("object"), self.storage.size(uri_hash), now)
+            return content, False
+        with self._lock:
+            self._accessed[uri_hash] = now
+            flush = self._touch_batch <= len(self._accessed)
+        if flush:
+            self.flush()
+        return content, self.is_stale(entry["object"], entry["stored"], now)
+
+    def put(self, uri_hash: str, name: str, content: dict) -> int:
+        size = self.storage.put(uri_hash, name, content)
+        self._track(uri_hash, content.get("object"), size, time.time())
+        if self.max_bytes < self.index.total_bytes(self.storage.backend):
+            self.evict(keep=uri_hash)
+        return size
+
+    def refresh(self, uri_hash: str) -> None:
+        # Revalidated upstream (304), the cached copy is fresh again
+        self.index.refresh(uri_hash, time.time())
+
+    def remove(self, uri_hash: str) -> None:
+        self.storage.remove(uri_hash)
+        self.index.forget(uri_hash)
+        with self._lock:
+            self._accessed.pop(uri_hash, None)
+
+    def _track(self, uri_hash: str, object_type: str, size: int, stored: float) -> None:
+        self.index.record(uri_hash, object_type, size, stored, self.storage.backend)
+
+    def is_stale(self, object_type: str, stored: float, now: float = None) -> bool:
+        ttl = self.ttls.get(object_type, self.default_ttl)
+        return ttl is not None and ttl < (now if now else time.time()) - stored
+
+    def flush(self) -> None:
+        with self._lock:
+            accessed, self._accessed = self._accessed, {}
+        if accessed:
+            self.index.touch(accessed)
+        return None
+
+    # ---- Maintenance ---- #
+    def evict(self, keep: str = None) -> tuple[int, int]:
+        # Least recently used first until the cache is back under the low water mark
+        self.flush()
+        total = self.index.total_bytes(self.storage.backend)
+        if total <= self.max_bytes:
+            return 0, 0
+        evicted, freed = self.index.evict(self.storage.backend, total - int(self.max_bytes * self.low_water), keep)
+        for uri_hash in evicted:
+            self.storage.remove(uri_hash)
+        with self._lock:
+            for uri_hash in evicted:
+                self._accessed.pop(uri_hash, None)
+        return len(evicted), freed
+
+    def sync(self) -> None:
+        # Tracks responses cached before entries existed, forgets entries of this backend whose response is gone,
+        # rows owned by another backend are left alone
+        stored = set(self.storage.keys())
+        tracked = {row[0] for row in self.index.entries(self.storage.backend)}
+        now = time.time()
+        for uri_hash in stored - tracked:
+            content = self.storage.get(uri_hash)
+            if content is not None:
+                self._track(uri_hash, content.get("object"), self.storage.size(uri_hash), now)
+        for uri_hash in tracked - stored:
+            self.remove(uri_hash)
+        return None
+
+    def prune(self) -> dict:
+        self.sync()
+        self.flush()
+        now = time.time()
+        expired = 0
+        freed = 0
+        for uri_hash, object_type, size, stored, _ in self.index.entries(self.storage.backend):
+            if self.is_stale(object_type, stored, now):
+                self.remove(uri_hash)
+                expired += 1
+                freed += size
+        evicted, evicted_bytes = self.evict()
+        return {"expired": expired, "evicted": evicted, "bytes": freed + evicted_bytes, "remaining": self.index.total_bytes(self.storage.backend)}
+
+    def stats(self) -> dict:
+        # Read only, responses this backend holds that are not tracked yet are only counted
+        now = time.time()
+        types = {}
+        for _, object_type, size, stored, _ in self.index.entries(self.storage.backend):
+            stats = types.setdefault(object_type, {"items": 0, "bytes": 0, "stale": 0})
+            stats["items"] += 1
+            stats["bytes"] += size
+            stats["stale"] += 1 if self.is_stale(object_type, stored, now) else 0
+        items = sum(t["items"] for t in types.values())
+        return {"types": types, "items": items, "untracked": max(0, self.storage.count() - items),
+                "bytes": self.index.total_bytes(self.storage.backend), "max_bytes": self.max_bytes}
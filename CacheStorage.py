@@ -0,0 +1,298 @@
+import abc
+import gzip
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import AnyStr
+
+from ScryfallCache import ScryfallCache
+
+# Optional serializer and compressor, only needed when a cache format asks for them
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SERIALIZERS = ["json", "msgpack"]
+COMPRESSIONS = ["none", "gzip", "zstd"]
+_COMPRESSION_EXT = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+# Everything a truncated or corrupt entry can raise while being decoded
+_DECODE_ERRORS = (OSError, ValueError, EOFError, zlib.error) \
+    + ((zstandard.ZstdError,) if zstandard else ()) \
+    + ((msgpack.exceptions.UnpackException,) if msgpack else ())
+
+
+class CacheStorage(abc.ABC):
+    """Where cached Scryfall responses live: a serializer, an optional compressor and a storage backend."""
+    backend = None
+
+    def __init__(self, serializer: str = "json", compression: str = "none") -> None:
+        if serializer not in SERIALIZERS:
+            raise ValueError(f"Unknown cache serializer: {serializer}")
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"Unknown cache compression: {compression}")
+        if "msgpack" == serializer and msgpack is None:
+            raise ValueError("The msgpack cache serializer needs the msgpack package")
+        if "zstd" == compression and zstandard is None:
+            raise ValueError("The zstd cache compression needs the zstandard package")
+        self.serializer = serializer
+        self.compression = compression
+
+    @property
+    def format(self) -> str:
+        return f"{self.backend}:{self.serializer}:{self.compression}"
+
+    # ---- Encoding ---- #
+    def encode(self, content: dict) -> bytes:
+        return self._compress(self._serialize(content, self.serializer), self.compression)
+
+    @staticmethod
+    def decode(data: bytes, serializer: str, compression: str) -> dict:
+        # Corrupt entries of any format surface as ValueError, which callers treat as a cache miss
+        try:
+            return CacheStorage._deserialize(CacheStorage._decompress(data, compression), serializer)
+        except _DECODE_ERRORS as e:
+            raise ValueError(f"Unreadable {serializer}/{compression} cache entry: {e}") from e
+
+    @staticmethod
+    def _serialize(content: dict, serializer: str) -> bytes:
+        if "msgpack" == serializer:
+            return msgpack.packb(content, use_bin_type=True)
+        return json.dumps(content, separators=(",", ":")).encode("utf-8")
+
+    @staticmethod
+    def _deserialize(data: bytes, serializer: str) -> dict:
+        if "msgpack" == serializer:
+            return msgpack.unpackb(data, raw=False)
+        return json.loads(data)
+
+    @staticmethod
+    def _compress(data: bytes, compression: str) -> bytes:
+        if "gzip" == compression:
+            return gzip.compress(data, compresslevel=6)
+        if "zstd" == compression:
+            return zstandard.ZstdCompressor(level=3).compress(data)
+        return data
+
+    @staticmethod
+    def _decompress(data: bytes, compression: str) -> bytes:
+        if "gzip" == compression:
+            return gzip.decompress(data)
+        if "zstd" == compression:
+            return zstandard.ZstdDecompressor().decompress(data)
+        return data
+
+    # ---- Storage ---- #
+    @abc.abstractmethod
+    def get(self, uri_hash: str) -> dict | None:
+        ...
+
+    @abc.abstractmethod
+    def put(self, uri_hash: str, name: str, content: dict) -> int:
+        # Returns the number of bytes stored
+        ...
+
+    @abc.abstractmethod
+    def remove(self, uri_hash: str) -> None:
+        ...
+
+    @abc.abstractmethod
+    def keys(self) -> list:
+        ...
+
+    @abc.abstractmethod
+    def name(self, uri_hash: str) -> str | None:
+        ...
+
+    @abc.abstractmethod
+    def size(self, uri_hash: str) -> int:
+        ...
+
+    def count(self) -> int:
+        return len(self.keys())
+
+    def close(self) -> None:
+        return None
+
+
+class FileStorage(CacheStorage):
+    """One file per response in per-type directories, found through the ScryfallCache index."""
+    backend = "file"
+
+    def __init__(self, index: ScryfallCache, dirs: dict, serializer: str = "json", compression: str = "none") -> None:
+        super().__init__(serializer, compression)
+        self.index = index
+        self.dirs = dirs
+
+    @property
+    def extension(self) -> str:
+        return f".{self.serializer}{_COMPRESSION_EXT[self.compression]}"
+
+    @staticmethod
+    def file_format(path: AnyStr) -> tuple[str, str, str]:
+        # Files say how they were written, so a cache holding several formats still reads back
+        base, ext = os.path.splitext(path)
+        compression = {v: k for k, v in _COMPRESSION_EXT.items() if v}.get(ext, "none")
+        if "none" != compression:
+            base, ext = os.path.splitext(base)
+        return base, ext.lstrip(".") if ext.lstrip(".") in SERIALIZERS else "json", compression
+
+    def get(self, uri_hash: str) -> dict | None:
+        path = self.index.lookup(uri_hash)
+        if not path:
+            return None
+        _, serializer, compression = self.file_format(path)
+        try:
+            with open(path, "rb") as f:
+                return self.decode(f.read(), serializer, compression)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, uri_hash: str, name: str, content: dict) -> int:
+        target_dir = self.dirs.get(content.get("object"), False)
+        if not target_dir:
+            raise ValueError(f"No cache directory for {content.get('object')} responses")
+        os.makedirs(target_dir, exist_ok=True)
+        path = os.path.join(target_dir, f"{name}{self.extension}")
+        temp_file = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        data = self.encode(content)
+        with open(temp_file, "wb") as f:
+            f.write(data)
+        os.replace(temp_file, path)
+
+        # Rewriting a response in another format must not leave the old file behind
+        previous = self.index.lookup(uri_hash)
+        if previous and os.path.abspath(previous) != os.path.abspath(path):
+            os.remove(previous)
+        self.index.add(uri_hash, path)
+        return len(data)
+
+    def remove(self, uri_hash: str) -> None:
+        path = self.index.lookup(uri_hash)
+        if path:
+            os.remove(path)
+        self.index.remove(uri_hash)
+
+    def keys(self) -> list:
+        return self.index.keys()
+
+    def name(self, uri_hash: str) -> str | None:
+        path = self.index.lookup(uri_hash)
+        return os.path.basename(self.file_format(path)[0]) if path else None
+
+    def size(self, uri_hash: str) -> int:
+        path = self.index.lookup(uri_hash)
+        return os.path.getsize(path) if path else 0
+
+    def count(self) -> int:
+        return self.index.count()
+
+
+class SqliteStorage(CacheStorage):
+    """Every response as a blob in one SQLite file, instead of hundreds of thousands of small files."""
+    backend = "sqlite"
+
+    def __init__(self, db_path: AnyStr, serializer: str = "json", compression: str = "none") -> None:
+        super().__init__(serializer, compression)
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        # Same journal settings as the ScryfallCache index
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._db:
+            self._db.execute("""CREATE TABLE IF NOT EXISTS responses (
+                hash TEXT PRIMARY KEY,
+                name TEXT NOT NULL,
+                object TEXT,
+                serializer TEXT NOT NULL,
+                compression TEXT NOT NULL,
+                data BLOB NOT NULL
+            )""")
+
+    def get(self, uri_hash: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute("SELECT serializer, compression, data FROM responses WHERE hash = ?",
+                                   (uri_hash,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return self.decode(row[2], row[0], row[1])
+        except ValueError:
+            return None
+
+    def put(self, uri_hash: str, name: str, content: dict) -> int:
+        data = self.encode(content)
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO responses (hash, name, object, serializer, compression, data) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", (uri_hash, name, content.get("object"), self.serializer,
+                                                           self.compression, data))
+        return len(data)
+
+    def remove(self, uri_hash: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM responses WHERE hash = ?", (uri_hash,))
+
+    def keys(self) -> list:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT hash FROM responses")]
+
+    def name(self, uri_hash: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT name FROM responses WHERE hash = ?", (uri_hash,)).fetchone()
+        return row[0] if row else None
+
+    def size(self, uri_hash: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT LENGTH(data) FROM responses WHERE hash = ?", (uri_hash,)).fetchone()
+        return row[0] if row else 0
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def parse_format(cache_format: str) -> tuple[str, str, str]:
+    # backend[:serializer[:compression]], e.g. "file", "file:json:gzip" or "sqlite:msgpack:zstd"
+    parts = (cache_format or "file").lower().split(":")
+    backend, serializer, compression = (parts + ["json", "none"][len(parts) - 1:])[:3]
+    if backend not in ["file", "sqlite"]:
+        raise ValueError(f"Unknown cache backend: {backend}")
+    return backend, serializer, compression
+
+
+def migrate(source: CacheStorage, target: CacheStorage) -> tuple[int, int]:
+    # Copies everything first and only then removes what reads back the same from the target,
+    # an interrupted migration leaves every response in at least one place. Returns (migrated, skipped)
+    copied = []
+    skipped = 0
+    for uri_hash in source.keys():
+        content = source.get(uri_hash)
+        name = source.name(uri_hash)
+        if content is None or not name:
+            skipped += 1
+            continue
+        try:
+            target.put(uri_hash, name, content)
+        except ValueError:
+            # No place for this kind of response in the target, e.g. no cache directory for its object type
+            skipped += 1
+            continue
+        copied.append(uri_hash)
+
+    if type(source) is not type(target):
+        for uri_hash in copied:
+            if target.get(uri_hash) == source.get(uri_hash):
+                source.remove(uri_hash)
+    return len(copied), skipped
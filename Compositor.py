@@ -0,0 +1,62 @@
+import numpy
+
+from LRUCache import LRUCache
+
+
+class Compositor:
+    """Alpha-composites RGBA layers into one preallocated premultiplied float32 canvas."""
+    # Bounding boxes of the visible pixels in named (cached) layers
+    _bboxes = LRUCache(max_items=1024)
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self._canvas = numpy.zeros((height, width, 4), dtype=numpy.float32)
+
+    def reset(self) -> None:
+        self._canvas.fill(0)
+
+    @staticmethod
+    def bbox(layer: numpy.ndarray) -> tuple[int, int, int, int] | None:
+        alpha = layer[..., 3]
+        rows = numpy.flatnonzero(alpha.any(axis=1))
+        if 0 == len(rows):
+            return None
+        cols = numpy.flatnonzero(alpha.any(axis=0))
+        return int(rows[0]), int(rows[-1]) + 1, int(cols[0]), int(cols[-1]) + 1
+
+    def add(self, layer: numpy.ndarray, position: tuple = (0, 0), key=None) -> bool:
+        if 3 == layer.shape[2]:
+            # No alpha channel (e.g. art), treat as fully opaque
+            layer = numpy.dstack([layer, numpy.full(layer.shape[:2], 255, dtype=layer.dtype)])
+        bbox = self._bboxes.get_or_create(key, lambda: self.bbox(layer)) if key is not None else self.bbox(layer)
+        if bbox is None:
+            # Fully transparent layer, nothing to blend
+            return False
+        top, bottom, left, right = bbox
+        x, y = int(position[0]), int(position[1])
+
+        # Clip the visible part of the layer to the canvas
+        y0, y1 = max(0, y + top), min(self.height, y + bottom)
+        x0, x1 = max(0, x + left), min(self.width, x + right)
+        if y0 >= y1 or x0 >= x1:
+            return False
+
+        src = layer[y0 - y:y1 - y, x0 - x:x1 - x].astype(numpy.float32)
+        src *= 1 / 255
+        src_alpha = src[..., 3:4]
+        src[..., :3] *= src_alpha
+
+        # Premultiplied "over": dst = src + dst * (1 - src_alpha)
+        dst = self._canvas[y0:y1, x0:x1]
+        dst *= 1 - src_alpha
+        dst += src
+        return True
+
+    def result(self) -> numpy.ndarray:
+        alpha = self._canvas[..., 3:4]
+        rgb = numpy.divide(self._canvas[..., :3], alpha, out=numpy.zeros_like(self._canvas[..., :3]), where=0 < alpha)
+        out = numpy.empty((self.height, self.width, 4), dtype=numpy.uint8)
+        out[..., :3] = numpy.clip(rgb * 255 + 0.5, 0, 255)
+        out[..., 3:4] = numpy.clip(alpha * 255 + 0.5, 0, 255)
+        return out
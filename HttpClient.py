@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+from typing import Any, AnyStr, Callable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class HttpClient:
+    """Pooled keep-alive session with bounded retries, compression and conditional (ETag / Last-Modified) requests."""
+    _retry_statuses = (429, 500, 502, 503, 504)
+
+    def __init__(self, user_agent: str = "Thran-Apparatus", retries: int = 5, backoff: float = 0.5,
+                 pool_size: int = 16, timeout: float = 30) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.session = requests.Session()
+        # No retries inside urllib3, get() retries itself so every attempt passes the caller's rate limiter
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "application/json;q=0.9,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate",
+        })
+
+    def get(self, url: AnyStr, etag: str = None, last_modified: str = None, throttle: Callable[[], Any] = None,
+            **kwargs) -> requests.Response:
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        timeout = kwargs.pop("timeout", self.timeout)
+
+        # Backs off exponentially on rate limits, server errors and dropped connections, honoring Retry-After
+        for attempt in range(self.retries + 1):
+            if throttle:
+                throttle()
+            try:
+                response = self.session.get(url, headers=headers, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if self.retries == attempt:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+            if response.status_code not in self._retry_statuses or self.retries == attempt:
+                return response
+            wait = self._retry_after(response, attempt)
+            response.close()
+            time.sleep(wait)
+
+    def _backoff(self, attempt: int) -> float:
+        return self.backoff * 2 ** attempt
+
+    def _retry_after(self, response: requests.Response, attempt: int) -> float:
+        try:
+            return max(0.0, float(response.headers.get("Retry-After", "")))
+        except ValueError:
+            return self._backoff(attempt)
+
+    def download(self, url: AnyStr, file_name: AnyStr, etag: str = None, last_modified: str = None,
+                 chunk_size: int = 1 << 16) -> requests.Response:
+        # Streams to a temporary file so a failed download never replaces a good one
+        with self.get(url, etag, last_modified, stream=True, allow_redirects=True) as response:
+            if 200 == response.status_code:
+                # Per thread as well, the art stage may fetch the same file on two threads at once
+                temp_file = f"{file_name}.{os.getpid()}.{threading.get_ident()}.part"
+                try:
+                    with open(temp_file, "wb") as f:
+                        for chunk in response.iter_content(chunk_size):
+                            f.write(chunk)
+                    os.replace(temp_file, file_name)
+                finally:
+                    if os.path.exists(temp_file):
+                        os.remove(temp_file)
+        return response
+
+    @staticmethod
+    def validators(response: requests.Response) -> dict:
+        return {"etag": response.headers.get("ETag"), "last_modified": response.headers.get("Last-Modified")}
+
+    def close(self) -> None:
+        self.session.close()
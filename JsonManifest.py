@@ -0,0 +1,49 @@
+import atexit
+import json
+import os
+import threading
+from typing import AnyStr
+
+
+class JsonManifest:
+    """A JSON manifest kept in memory and written back atomically in batches of changes, and at exit."""
+
+    def __init__(self, manifest_file: AnyStr, save_every: int = 0) -> None:
+        self.manifest_file = manifest_file
+        self.save_every = save_every
+        self._lock = threading.RLock()
+        self._manifest = self._load()
+        self._changes = 0
+        atexit.register(self.flush)
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.manifest_file):
+            return {}
+        try:
+            with open(self.manifest_file, "r") as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            # A broken manifest only costs us what it recorded, start over
+            return {}
+
+    def _changed(self) -> None:
+        # Callers hold the lock
+        self._changes += 1
+        if self.save_every and self.save_every <= self._changes:
+            self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            os.makedirs(os.path.dirname(self.manifest_file) or ".", exist_ok=True)
+            temp_file = f"{self.manifest_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_file, "w") as f:
+                f.write(json.dumps(self._manifest, indent=4))
+            os.replace(temp_file, self.manifest_file)
+            self._changes = 0
+        return None
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._changes:
+                self.save()
+        return None
@@ -0,0 +1,97 @@
+import collections
+import sys
+import threading
+from typing import Any, Callable, Hashable
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by item count and/or total size in bytes."""
+
+    def __init__(self, max_items: int = None, max_bytes: int = None, sizeof: Callable[[Any], int] = None) -> None:
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof if sizeof else self._default_sizeof
+        self._items = collections.OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _default_sizeof(value: Any) -> int:
+        # numpy arrays know their buffer size, everything else gets a shallow estimate
+        return int(getattr(value, "nbytes", sys.getsizeof(value)))
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key: Hashable, value: Any, size: int = None) -> Any:
+        # Callers that already know what the value weighs pass size and skip sizeof
+        size = self._sizeof(value) if size is None else size
+        with self._lock:
+            if key in self._items:
+                self._bytes -= self._sizes.pop(key)
+                del self._items[key]
+            # Anything bigger than the whole cache is handed back without being stored
+            if self.max_bytes is not None and size > self.max_bytes:
+                return value
+            self._items[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            self._evict()
+        return value
+
+    def get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, factory())
+        return value
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._bytes -= self._sizes.pop(key)
+            return self._items.pop(key)
+
+    def _evict(self) -> None:
+        while self._items and ((self.max_items is not None and len(self._items) > self.max_items)
+                               or (self.max_bytes is not None and self._bytes > self.max_bytes)):
+            key, _ = self._items.popitem(last=False)
+            self._bytes -= self._sizes.pop(key)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "items": len(self._items),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
@@ -0,0 +1,134 @@
+import functools
+from typing import Any, Callable
+
+import replus as rp
+
+from LRUCache import LRUCache
+
+# Cheapest checks first so a failing node bails out before any regex runs
+_OPERATOR_COST = {"len": 0, "has": 1, "is": 1, "not": 1, "regex": 2}
+_FIELD_ALIASES = {"type": "type_line"}
+
+
+class LayerNode:
+    def __init__(self, path: tuple, data: dict, predicates: list, children: list) -> None:
+        self.path = path
+        self.data = data
+        self.predicates = predicates
+        self.children = children
+
+    @property
+    def name(self) -> str:
+        return ".".join(self.path)
+
+    def __repr__(self) -> str:
+        return f"LayerNode({self.name})"
+
+
+class LayerConditions:
+    """The template [layers] tree with its conditions compiled once, and per-card selections memoized."""
+
+    def __init__(self, layers: dict, memo_size: int = 4096) -> None:
+        self.fields = []
+        self.root = self._compile_node((), layers)
+        self._memo = LRUCache(max_items=memo_size)
+
+    # ---- Compilation ---- #
+    def _compile_node(self, path: tuple, node: dict) -> LayerNode:
+        data = {k: v for k, v in node.items() if "conditions" != k and not isinstance(v, dict)}
+        predicates = [self._compile_condition(k, v) for k, v in node.get("conditions", {}).items()]
+        predicates.sort(key=lambda p: p[0])
+        children = [self._compile_node(path + (k,), v) for k, v in node.items()
+                    if "conditions" != k and isinstance(v, dict)]
+        return LayerNode(path, data, [p[1] for p in predicates], children)
+
+    def _compile_condition(self, key: str, value: Any) -> tuple[int, Callable]:
+        match = rp.fullmatch(r"/(has|is|not|len|regex)_(\w+?)(?:_(lt|gt))?/", key)
+        if not match:
+            raise ValueError(f"Unknown layer condition: {key}")
+        operator, field, comparison = match.groups()
+        if "len" != operator and comparison:
+            # Only len_ conditions take a comparison suffix, anything else is part of the field name
+            field = f"{field}_{comparison}"
+        field = _FIELD_ALIASES.get(field, field)
+        if field not in self.fields:
+            self.fields.append(field)
+        index = self.fields.index(field)
+
+        if "len" == operator:
+            compare = {"lt": lambda a, b: a < b, "gt": lambda a, b: a > b}.get(comparison, lambda a, b: a == b)
+            target = int(value)
+            check = lambda values: compare(_length(values[index]), target)
+        elif "regex" == operator:
+            patterns = [rp.compile(p) for p in (value if isinstance(value, list) else [value])]
+            check = lambda values: any(p.search(_text(values[index])) for p in patterns)
+        else:
+            items = frozenset(str(v).lower() for v in (value if isinstance(value, list) else [value]))
+            if "has" == operator:
+                check = lambda values: not _tokens(values[index]).isdisjoint(items)
+            elif "is" == operator:
+                check = lambda values: _tokens(values[index]) == items
+            else:
+                check = lambda values: _tokens(values[index]).isdisjoint(items)
+        return _OPERATOR_COST[operator], check
+
+    # ---- Selection ---- #
+    def card_values(self, card: Any) -> tuple:
+        return tuple(_field_value(card, field) for field in self.fields)
+
+    def select(self, card: Any) -> tuple[LayerNode, ...]:
+        # Cards with the same values for every referenced field always pick the same layers
+        values = self.card_values(card)
+        try:
+            hash(values)
+        except TypeError:
+            return tuple(self._walk(self.root, values, []))
+        return self._memo.get_or_create(values, lambda: tuple(self._walk(self.root, values, [])))
+
+    def _walk(self, node: LayerNode, values: tuple, selected: list) -> list[LayerNode]:
+        if not all(check(values) for check in node.predicates):
+            return selected
+        if node.data:
+            selected.append(node)
+        for child in node.children:
+            self._walk(child, values, selected)
+        return selected
+
+    def stats(self) -> dict:
+        return self._memo.stats()
+
+
+def _field_value(card: Any, field: str) -> Any:
+    value = card.get(field) if isinstance(card, dict) else getattr(card, field, None)
+    if hasattr(value, "cost"):
+        # ManaCost objects compare by their cost string
+        value = value.cost
+    if isinstance(value, (list, tuple)):
+        return tuple(str(v) for v in value)
+    return value
+
+
+def _tokens(value: Any) -> frozenset:
+    if value is None:
+        return frozenset()
+    if isinstance(value, tuple):
+        return frozenset(v.lower() for v in value)
+    # Dicts and other unhashable fields (e.g. image_uris) are tokenized through their text
+    return _words(str(value).lower())
+
+
+@functools.lru_cache(maxsize=4096)
+def _words(text: str) -> frozenset:
+    return frozenset(rp.findall(r"/[^\W\d_]+/", text))
+
+
+def _length(value: Any) -> int:
+    if value is None:
+        return 0
+    return len(value) if isinstance(value, tuple) else len(str(value))
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ""
+    return " ".join(value) if isinstance(value, tuple) else str(value)
@@ -0,0 +1,88 @@
+import atexit
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+from typing import AnyStr
+
+
+class LogWriter:
+    """Appends log messages from a background thread through a single open file handle."""
+
+    def __init__(self, file_name: AnyStr, structured: bool = False, queue_size: int = 10000, batch_size: int = 256,
+                 flush_interval: float = 0.5) -> None:
+        self.file_name = file_name
+        self.structured = structured
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self.broken = False
+        self.pid = os.getpid()
+
+        os.makedirs(os.path.dirname(file_name) or ".", exist_ok=True)
+        self._file = open(file_name, mode="a", encoding="utf-8")
+        self._thread = threading.Thread(target=self._run, name="LogWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, msg: AnyStr, **fields) -> None:
+        if self._closed or self.broken:
+            return None
+        # Blocks when the queue is full, so a runaway producer can't eat all the memory
+        self._queue.put((time.time(), msg, fields))
+        return None
+
+    def flush(self) -> None:
+        if not self._closed and not self.broken:
+            self._queue.join()
+        return None
+
+    def close(self) -> None:
+        if self._closed:
+            return None
+        self.flush()
+        self._closed = True
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        return None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = None in batch
+            lines = [self._format(*record) for record in batch if record is not None]
+            try:
+                if lines and not self.broken:
+                    self._file.write("".join(lines))
+                    self._file.flush()
+            except (OSError, ValueError):
+                # Disk full or a closed handle: stop writing, but keep draining so flush() never waits forever
+                self.broken = True
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return None
+
+    def _format(self, timestamp: float, msg: AnyStr, fields: dict) -> str:
+        moment = datetime.datetime.fromtimestamp(timestamp)
+        if self.structured:
+            return json.dumps({"time": moment.isoformat(timespec="milliseconds"), "message": str(msg), **fields}) + "\n"
+        return f"[{moment.strftime('%Y-%m-%d %H:%M:%S')}] {msg}\n"
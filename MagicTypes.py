@@ -1,8 +1,9 @@
-import re
+import enum
+import functools
 
 
 class BaseTypeObject(object):
-    types: dict = {}
+    types: dict = None
 
     @staticmethod
     def _parse_type_line(type_line: str, group: int = 0):
@@ -45,49 +46,77 @@ class BaseTypeObject(object):
         return len(self.list)
 
 
-class SuperTypes(BaseTypeObject):
+class BaseTypeFlag(enum.Flag):
+    # A card's types as one int-sized flag value instead of a dict of booleans per card
 
-    def __init__(self, type_line) -> None:
-        self.types = {
-            "Basic": False,
-            "Elite": False,
-            "Host": False,
-            "Legendary": False,
-            "Ongoing": False,
-            "Snow": False,
-            "World": False,
-        }
-        self.add_types(self._parse_type_line(type_line, 0))
+    @classmethod
+    def from_type_line(cls, type_line: str) -> "BaseTypeFlag":
+        return cls.from_names(BaseTypeObject._parse_type_line(str(type_line), 0))
 
+    @classmethod
+    @functools.lru_cache(maxsize=1024)
+    def from_names(cls, type_list: str) -> "BaseTypeFlag":
+        flags = cls(0)
+        for t in type_list.split(" "):
+            flags |= cls.__members__.get(t.strip(), cls(0))
+        return flags
 
-class CardTypes(BaseTypeObject):
+    def includes(self, type_name: str) -> bool:
+        member = self.__class__.__members__.get(type_name.strip())
+        return member is not None and member in self
 
-    def __init__(self, type_line: str) -> None:
-        self.types = {
-            "Artifact": False,
-            "Conspiracy": False,
-            "Creature": False,
-            "Dungeon": False,
-            "Enchantment": False,
-            "Instant": False,
-            "Land": False,
-            "Phenomenon": False,
-            "Plane": False,
-            "Planeswalker": False,
-            "Sorcery": False,
-            "Tribal": False,
-            "Vanguard": False,
-            "Scheme": False,
-        }
-        self.add_types(self._parse_type_line(type_line, 0))
+    def excludes(self, type_name: str) -> bool:
+        return not self.includes(type_name)
+
+    @property
+    def list(self) -> list:
+        return [member.name for member in self.__class__ if member in self]
+
+    @property
+    def string(self) -> str:
+        return " ".join(self.list)
+
+    @property
+    def count(self) -> int:
+        return len(self.list)
+
+
+class SuperTypes(BaseTypeFlag):
+    Basic = enum.auto()
+    Elite = enum.auto()
+    Host = enum.auto()
+    Legendary = enum.auto()
+    Ongoing = enum.auto()
+    Snow = enum.auto()
+    World = enum.auto()
+
+
+class CardTypes(BaseTypeFlag):
+    Artifact = enum.auto()
+    Conspiracy = enum.auto()
+    Creature = enum.auto()
+    Dungeon = enum.auto()
+    Enchantment = enum.auto()
+    Instant = enum.auto()
+    Land = enum.auto()
+    Phenomenon = enum.auto()
+    Plane = enum.auto()
+    Planeswalker = enum.auto()
+    Sorcery = enum.auto()
+    Tribal = enum.auto()
+    Vanguard = enum.auto()
+    Scheme = enum.auto()
 
 
 class SubTypes(BaseTypeObject):
     def __init__(self, type_line: str) -> None:
+        # Every instance gets its own dict, the class level one used to be shared by all cards
+        self.types = {}
         self.add_types(self._parse_type_line(type_line, 1))
 
     def add_type(self, t: str) -> None:
-        self.types[t.strip()] = True
+        if t.strip():
+            self.types[t.strip()] = True
 
     def del_type(self, t: str) -> None:
         self.types.pop(t.strip(), None)
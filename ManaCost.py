@@ -1,6 +1,9 @@
+import functools
 import json
 import replus as rp
 
+COLORS = ['W', 'U', 'B', 'R', 'G']
+
 
 class ManaCost:
     cost: str = ""
@@ -18,6 +21,74 @@ class ManaCost:
             if hasattr(self, key):
                 setattr(self, key, value)
 
+    @classmethod
+    def parse(cls, cost: str) -> dict:
+        # Same shape as the Scryfall symbology/parse-mana response
+        cost, colors, cmc, _, _ = cls._parse_cost(cost.strip())
+        return {
+            "object": "mana_cost",
+            "cost": cost,
+            "colors": list(colors),
+            "cmc": cmc,
+            "colorless": 0 == len(colors),
+            "monocolored": 1 == len(colors),
+            "multicolored": 1 < len(colors),
+        }
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _parse_cost(cost: str) -> tuple[str, tuple, float, bool, bool]:
+        symbols = rp.findall(r"/\{([^{}]+)\}/", cost)
+        if not symbols or rp.sub(r"/\{[^{}]+\}|\/\/|\s+/", "", cost):
+            raise ValueError(f"Invalid mana cost: {cost}")
+
+        colors = set()
+        cmc = 0.0
+        hybrid = False
+        phyrexian = False
+        for symbol in symbols:
+            parts = symbol.upper().split("/")
+            if ["P"] == parts:
+                # Generic Phyrexian mana, one mana of any color or 2 life
+                phyrexian = True
+                cmc += 1.0
+                continue
+            if "P" in parts[1:]:
+                phyrexian = True
+                parts = [p for p in parts if "P" != p]
+            if 1 < len(parts):
+                hybrid = True
+            values = []
+            for part in parts:
+                value, color = ManaCost._symbol_value(part, symbol)
+                values.append(value)
+                if color:
+                    colors.add(color)
+            cmc += max(values)
+
+        normalized = rp.sub(r"/\{[^{}]+\}/", lambda m: m.group(0).upper(), cost)
+        return normalized, tuple(c for c in COLORS if c in colors), cmc, hybrid, phyrexian
+
+    @staticmethod
+    def _symbol_value(part: str, symbol: str) -> tuple[float, str | None]:
+        if part.isdigit():
+            return float(part), None
+        if part in COLORS:
+            return 1.0, part
+        if 2 == len(part) and "H" == part[0] and part[1] in COLORS:
+            # Half mana, e.g. {HW}
+            return 0.5, part[1]
+        if part in ["C", "S"]:
+            return 1.0, None
+        if part in ["X", "Y", "Z"]:
+            return 0.0, None
+        if "½" == part:
+            return 0.5, None
+        if "∞" == part:
+            # Scryfall's own value, float("inf") would end up as non-standard JSON in caches and manifests
+            return 1000000.0, None
+        raise ValueError(f"Unknown mana symbol: {{{symbol}}}")
+
     def includes(self, type_name: str) -> bool:
         return self.types.get(type_name.strip(), False)
 
@@ -47,8 +118,14 @@ class ManaCost:
 
     @property
     def hybrid(self) -> bool:
-        return True if rp.search("/\{[WUBRG2]/[WUBRG](\/P)?\}/i", self.cost) else False
+        try:
+            return self._parse_cost(self.cost)[3]
+        except ValueError:
+            return False
 
     @property
     def phyrexian(self) -> bool:
-        return True if rp.search("/[WUBRG2]/P\}/i", self.cost) else False
+        try:
+            return self._parse_cost(self.cost)[4]
+        except ValueError:
+            return False
@@ -0,0 +1,79 @@
+import queue
+import threading
+from typing import Any, Callable, Iterable
+
+# End-of-stream marker, one per worker of the receiving stage
+_DONE = object()
+
+
+class Pipeline:
+    """Chain of stages connected by bounded queues, each stage running its own pool of worker threads."""
+
+    def __init__(self, stages: list[tuple[str, Callable[[Any], Any], int]], queue_size: int = 16) -> None:
+        self.stages = [(name, func, max(1, int(workers))) for name, func, workers in stages]
+        self.queue_size = queue_size
+        self.stats = {name: {"in": 0, "out": 0, "dropped": 0, "errors": []} for name, _, _ in self.stages}
+        self._lock = threading.Lock()
+
+    def run(self, source: Iterable) -> list[tuple[int, Any]]:
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results = []
+        remaining = [workers for _, _, workers in self.stages]
+        threads = []
+
+        for n, (name, func, workers) in enumerate(self.stages):
+            outbox = queues[n + 1] if n + 1 < len(queues) else None
+            for w in range(workers):
+                thread = threading.Thread(target=self._work, name=f"{name}-{w}", daemon=True,
+                                          args=(n, func, queues[n], outbox, remaining, results))
+                thread.start()
+                threads.append(thread)
+
+        # Feeding blocks whenever the first queue is full, so the source is only read as fast as it's consumed
+        try:
+            for index, item in enumerate(source):
+                queues[0].put((index, item))
+        finally:
+            # A failing source still ends the stream, the end marker cascades through every stage before it raises
+            for _ in range(self.stages[0][2]):
+                queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+        return sorted(results, key=lambda r: r[0])
+
+    def _work(self, n: int, func: Callable, inbox: queue.Queue, outbox: queue.Queue | None, remaining: list,
+              results: list) -> None:
+        name = self.stages[n][0]
+        while True:
+            entry = inbox.get()
+            if entry is _DONE:
+                break
+            index, item = entry
+            with self._lock:
+                self.stats[name]["in"] += 1
+            try:
+                result = func(item)
+            except (Exception, SystemExit) as e:
+                with self._lock:
+                    self.stats[name]["errors"].append((index, f"{type(e).__name__}: {e}"))
+                continue
+            if result is None:
+                # Stage filtered the item out (e.g. card not found)
+                with self._lock:
+                    self.stats[name]["dropped"] += 1
+                continue
+            with self._lock:
+                self.stats[name]["out"] += 1
+            if outbox is None:
+                with self._lock:
+                    results.append((index, result))
+            else:
+                outbox.put((index, result))
+
+        # Last worker out tells every worker of the next stage that the stream is over
+        with self._lock:
+            remaining[n] -= 1
+            last = 0 == remaining[n]
+        if last and outbox is not None:
+            for _ in range(self.stages[n + 1][2]):
+                outbox.put(_DONE)
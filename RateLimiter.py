@@ -0,0 +1,26 @@
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float = 10.0, capacity: float = 1.0) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        # Reserve the tokens under the lock, then sleep outside of it so other threads can queue up behind us
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = 0.0 if 0 <= self._tokens else -self._tokens / self.rate
+        if 0 < wait:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,26 @@
+import hashlib
+import json
+import os
+import time
+from typing import AnyStr
+
+from JsonManifest import JsonManifest
+
+
+class RenderManifest(JsonManifest):
+    """Fingerprints of the inputs behind every render, so unchanged cards can be skipped."""
+
+    @staticmethod
+    def fingerprint(inputs: dict) -> str:
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def is_current(self, output: AnyStr, fingerprint: str) -> bool:
+        with self._lock:
+            entry = self._manifest.get(os.path.normpath(output))
+        return entry is not None and fingerprint == entry["fingerprint"] and os.path.exists(output)
+
+    def record(self, output: AnyStr, fingerprint: str, inputs: dict) -> None:
+        with self._lock:
+            self._manifest[os.path.normpath(output)] = {"fingerprint": fingerprint, "inputs": inputs,
+                                                        "rendered": time.time()}
+            self._changed()
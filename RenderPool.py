@@ -0,0 +1,58 @@
+import concurrent.futures
+import math
+from typing import Any, Callable
+
+# Per-process renderer, built once by the pool initializer
+_worker = None
+
+
+def _init_worker(factory: Callable, options: dict) -> None:
+    global _worker
+    _worker = factory(options)
+
+
+def _render_chunk(chunk: list) -> list:
+    results = [_worker.render_card_entry(index, card) for index, card in chunk]
+    # Pool processes skip atexit handlers, so don't leave log lines or cache access times sitting in memory
+    _worker.flush_logs()
+    _worker.flush_caches()
+    return results
+
+
+class RenderPool:
+    def __init__(self, jobs: int, factory: Callable, options: dict, chunk_size: int = None) -> None:
+        self.jobs = jobs
+        self.factory = factory
+        self.options = options
+        self.chunk_size = chunk_size
+        self._executor = None
+
+    def __enter__(self) -> "RenderPool":
+        self._executor = concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker,
+                                                                initargs=(self.factory, self.options))
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._executor.shutdown()
+        self._executor = None
+
+    def render_one(self, index: int, card: object) -> tuple[int, bool, Any]:
+        # For streaming callers, blocks until a worker has rendered this card
+        return self._executor.submit(_render_chunk, [(index, card)]).result()[0]
+
+    def render(self, cards: list) -> list[tuple[int, bool, Any]]:
+        entries = list(enumerate(cards))
+        if not entries:
+            return []
+
+        # A few chunks per worker keeps them busy without paying pickling overhead for every card
+        chunk_size = self.chunk_size if self.chunk_size else max(1, math.ceil(len(entries) / (self.jobs * 4)))
+        chunks = [entries[i:i + chunk_size] for i in range(0, len(entries), chunk_size)]
+
+        results = []
+        with self:
+            for chunk_results in self._executor.map(_render_chunk, chunks):
+                results.extend(chunk_results)
+
+        # Results are reported in input order no matter which worker rendered them
+        return sorted(results, key=lambda r: r[0])
@@ -0,0 +1,132 @@
+import json
+import os
+import sqlite3
+import threading
+from typing import AnyStr, Iterator
+
+
+class ScryfallBulkData:
+    """Local card store built from Scryfall bulk data files (default_cards / all_cards), English printings first."""
+    _chunk_size = 1 << 20
+
+    def __init__(self, db_path: AnyStr = "./_cache/scryfall/bulk.sqlite") -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("""CREATE TABLE IF NOT EXISTS cards (
+                id TEXT PRIMARY KEY,
+                name_lower TEXT NOT NULL,
+                set_code TEXT NOT NULL,
+                collector_number TEXT NOT NULL,
+                released_at TEXT,
+                json TEXT NOT NULL,
+                lang TEXT
+            )""")
+            # Stores ingested before languages were kept, those rows count as English until re-ingested
+            if "lang" not in [row[1] for row in self._db.execute("PRAGMA table_info(cards)")]:
+                self._db.execute("ALTER TABLE cards ADD COLUMN lang TEXT")
+            # Double-faced, split and adventure cards are named "Front // Back", each face is looked up on its own
+            self._db.execute("""CREATE TABLE IF NOT EXISTS card_faces (
+                name_lower TEXT NOT NULL,
+                id TEXT NOT NULL,
+                PRIMARY KEY (name_lower, id)
+            )""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS cards_name ON cards (name_lower, set_code)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS cards_set_number ON cards (set_code, collector_number)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS card_faces_id ON card_faces (id)")
+
+    # ---- Ingestion ---- #
+    @staticmethod
+    def iter_json_array(file_name: AnyStr, chunk_size: int = _chunk_size) -> Iterator[dict]:
+        # Yields the elements of a top-level JSON array one at a time without loading the whole file
+        decoder = json.JSONDecoder()
+        with open(file_name, "r", encoding="utf-8") as f:
+            buffer = ""
+            while not buffer:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                buffer = chunk.lstrip()
+            if not buffer.startswith("["):
+                raise ValueError(f"{file_name} does not contain a JSON array")
+            pos = 1
+            eof = False
+            while True:
+                # Skip separators between array elements
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer) and "]" == buffer[pos]:
+                    return
+                try:
+                    if pos >= len(buffer):
+                        raise ValueError("buffer exhausted")
+                    item, pos = decoder.raw_decode(buffer, pos)
+                    yield item
+                except ValueError:
+                    if eof:
+                        raise ValueError(f"Truncated JSON array in {file_name}")
+                    chunk = f.read(chunk_size)
+                    eof = not chunk
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+
+    def ingest(self, file_name: AnyStr, batch_size: int = 1000) -> int:
+        count = 0
+        batch = []
+        faces = []
+        with self._lock, self._db:
+            for card in self.iter_json_array(file_name):
+                if "card" != card.get("object", False):
+                    continue
+                batch.append((card["id"], card["name"].lower(), card["set"].lower(),
+                              str(card["collector_number"]).lower(), card.get("released_at", ""),
+                              json.dumps(card, separators=(",", ":")), card.get("lang", "en")))
+                faces += [(face["name"].lower(), card["id"]) for face in card.get("card_faces", [])
+                          if face.get("name") and face["name"] != card["name"]]
+                if batch_size <= len(batch):
+                    count += self._insert(batch, faces)
+                    batch = []
+                    faces = []
+            count += self._insert(batch, faces)
+        return count
+
+    def _insert(self, batch: list, faces: list) -> int:
+        self._db.executemany("INSERT OR REPLACE INTO cards (id, name_lower, set_code, collector_number, released_at, "
+                             "json, lang) VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+        self._db.executemany("DELETE FROM card_faces WHERE id = ?", [(row[0],) for row in batch])
+        self._db.executemany("INSERT OR REPLACE INTO card_faces (name_lower, id) VALUES (?, ?)", faces)
+        return len(batch)
+
+    # ---- Lookups ---- #
+    def _fetch_one(self, query: str, params: tuple) -> dict | None:
+        with self._lock:
+            row = self._db.execute(query, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def by_id(self, card_id: str) -> dict | None:
+        return self._fetch_one("SELECT json FROM cards WHERE id = ?", (card_id,))
+
+    def by_set_number(self, set_code: str, collector_number: str) -> dict | None:
+        return self._fetch_one("SELECT json FROM cards WHERE set_code = ? AND collector_number = ?",
+                               (set_code.lower(), str(collector_number).lower()))
+
+    def by_name(self, name: str, set_code: str = "") -> dict | None:
+        # Full name or any face name, the newest English printing wins like it does on the API
+        match = "(name_lower = ? OR id IN (SELECT id FROM card_faces WHERE name_lower = ?))"
+        order = "ORDER BY COALESCE(lang, 'en') = 'en' DESC, released_at DESC LIMIT 1"
+        if set_code:
+            card = self._fetch_one(f"SELECT json FROM cards WHERE {match} AND set_code = ? {order}",
+                                   (name.lower(), name.lower(), set_code.lower()))
+            if card:
+                return card
+        return self._fetch_one(f"SELECT json FROM cards WHERE {match} {order}", (name.lower(), name.lower()))
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,182 @@
+import os
+import sqlite3
+import threading
+from typing import AnyStr
+
+import replus as rp
+
+
+class ScryfallCache:
+    """Persistent index of the on-disk Scryfall cache, mapping URI hashes straight to cache files."""
+    _index_name = "index.sqlite"
+    _filename_hash = rp.compile(r"/_([0-9a-f]{32})\.(?:json|msgpack)(?:\.gz|\.zst)?$/i")
+
+    def __init__(self, cache_root: AnyStr = "./_cache/scryfall") -> None:
+        self.cache_root = cache_root
+        self._lock = threading.Lock()
+        os.makedirs(cache_root, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_root, self._index_name), check_same_thread=False)
+        # Every response is its own small transaction, WAL keeps those from each waiting on a full sync
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        with self._lock, self._db:
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache_index (hash TEXT PRIMARY KEY, path TEXT NOT NULL)")
+            # HTTP validators outlive index rebuilds, they are keyed on the URI hash rather than the cache file
+            self._db.execute("CREATE TABLE IF NOT EXISTS validators (hash TEXT PRIMARY KEY, etag TEXT, last_modified TEXT)")
+            # Age, size and last use of every cached response, whichever storage backend holds it
+            self._db.execute("""CREATE TABLE IF NOT EXISTS entries (
+                hash TEXT PRIMARY KEY,
+                object TEXT,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                stored REAL NOT NULL,
+                accessed REAL NOT NULL,
+                backend TEXT
+            )""")
+            # Indexes from before entries knew their backend, those rows stay unowned until they are seen again
+            if "backend" not in [row[1] for row in self._db.execute("PRAGMA table_info(entries)")]:
+                self._db.execute("ALTER TABLE entries ADD COLUMN backend TEXT")
+            self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            # Running size per backend, kept in the same transaction as every entries write so it never drifts
+            seed = not self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'totals'").fetchone()
+            self._db.execute("CREATE TABLE IF NOT EXISTS totals (backend TEXT PRIMARY KEY, bytes INTEGER NOT NULL)")
+            if seed:
+                self._db.execute("INSERT INTO totals (backend, bytes) SELECT backend, SUM(bytes) FROM entries "
+                                 "WHERE backend IS NOT NULL GROUP BY backend")
+
+    def lookup(self, uri_hash: str) -> str | bool:
+        with self._lock:
+            row = self._db.execute("SELECT path FROM cache_index WHERE hash = ?", (uri_hash,)).fetchone()
+        if row is None:
+            return False
+        path = os.path.join(self.cache_root, row[0])
+        if not os.path.exists(path):
+            # File was removed behind our back, drop the stale entry
+            self.remove(uri_hash)
+            return False
+        return path
+
+    def add(self, uri_hash: str, path: AnyStr) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO cache_index (hash, path) VALUES (?, ?)",
+                             (uri_hash, os.path.relpath(path, self.cache_root)))
+
+    def remove(self, uri_hash: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache_index WHERE hash = ?", (uri_hash,))
+
+    def validators(self, uri_hash: str) -> dict:
+        with self._lock:
+            row = self._db.execute("SELECT etag, last_modified FROM validators WHERE hash = ?", (uri_hash,)).fetchone()
+        return {"etag": row[0], "last_modified": row[1]} if row else {"etag": None, "last_modified": None}
+
+    def set_validators(self, uri_hash: str, etag: str = None, last_modified: str = None) -> None:
+        with self._lock, self._db:
+            if etag or last_modified:
+                self._db.execute("INSERT OR REPLACE INTO validators (hash, etag, last_modified) VALUES (?, ?, ?)",
+                                 (uri_hash, etag, last_modified))
+            else:
+                self._db.execute("DELETE FROM validators WHERE hash = ?", (uri_hash,))
+
+    def entry(self, uri_hash: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute("SELECT object, bytes, stored, accessed, backend FROM entries WHERE hash = ?",
+                                   (uri_hash,)).fetchone()
+        return {"object": row[0], "bytes": row[1], "stored": row[2], "accessed": row[3], "backend": row[4]} \
+            if row else None
+
+    def entries(self, backend: str) -> list[tuple]:
+        # Least recently used first among the responses held by backend: (hash, object, bytes, stored, accessed)
+        with self._lock:
+            return self._db.execute("SELECT hash, object, bytes, stored, accessed FROM entries WHERE backend = ? "
+                                    "ORDER BY accessed", (backend,)).fetchall()
+
+    def record(self, uri_hash: str, object_type: str, size: int, stored: float, backend: str) -> None:
+        with self._lock, self._db:
+            self._release(uri_hash)
+            self._db.execute("INSERT OR REPLACE INTO entries (hash, object, bytes, stored, accessed, backend) "
+                             "VALUES (?, ?, ?, ?, ?, ?)", (uri_hash, object_type, size, stored, stored, backend))
+            self._charge(backend, size)
+
+    def refresh(self, uri_hash: str, stored: float) -> None:
+        with self._lock, self._db:
+            self._db.execute("UPDATE entries SET stored = ?, accessed = ? WHERE hash = ?", (stored, stored, uri_hash))
+
+    def resize(self, uri_hash: str, size: int, backend: str) -> None:
+        # After a migration: the response now lives in backend, at its new size
+        with self._lock, self._db:
+            if self._release(uri_hash):
+                self._db.execute("UPDATE entries SET bytes = ?, backend = ? WHERE hash = ?", (size, backend, uri_hash))
+                self._charge(backend, size)
+
+    def touch(self, accessed: dict) -> None:
+        with self._lock, self._db:
+            self._db.executemany("UPDATE entries SET accessed = ? WHERE hash = ?",
+                                 [(when, uri_hash) for uri_hash, when in accessed.items()])
+
+    def forget(self, uri_hash: str) -> None:
+        with self._lock, self._db:
+            self._release(uri_hash)
+            self._db.execute("DELETE FROM entries WHERE hash = ?", (uri_hash,))
+            self._db.execute("DELETE FROM validators WHERE hash = ?", (uri_hash,))
+
+    def evict(self, backend: str, free: int, keep: str = None) -> tuple[list, int]:
+        # Forgets the least recently used entries of backend until at least free bytes are released, in one
+        # transaction. Returns their hashes and size, removing the responses themselves is up to the storage
+        with self._lock, self._db:
+            count = self._db.execute("""SELECT COUNT(*) FROM (
+                SELECT bytes, SUM(bytes) OVER (ORDER BY accessed, hash) AS running FROM entries
+                WHERE backend = ? AND hash IS NOT ?
+            ) WHERE running - bytes < ?""", (backend, keep, free)).fetchone()[0]
+            if not count:
+                return [], 0
+            lru = "SELECT hash FROM entries WHERE backend = ? AND hash IS NOT ? ORDER BY accessed, hash LIMIT ?"
+            evicted = [row[0] for row in self._db.execute(lru, (backend, keep, count))]
+            freed = self._db.execute(f"SELECT SUM(bytes) FROM entries WHERE hash IN ({lru})",
+                                     (backend, keep, count)).fetchone()[0]
+            self._db.execute(f"DELETE FROM validators WHERE hash IN ({lru})", (backend, keep, count))
+            self._db.execute(f"DELETE FROM entries WHERE hash IN ({lru})", (backend, keep, count))
+            self._charge(backend, -freed)
+        return evicted, freed
+
+    def total_bytes(self, backend: str) -> int:
+        with self._lock:
+            row = self._db.execute("SELECT bytes FROM totals WHERE backend = ?", (backend,)).fetchone()
+        return row[0] if row else 0
+
+    def _release(self, uri_hash: str) -> bool:
+        # Inside a write transaction: takes an entry's bytes off its backend's total before it changes or goes away
+        row = self._db.execute("SELECT bytes, backend FROM entries WHERE hash = ?", (uri_hash,)).fetchone()
+        if row and row[1] is not None:
+            self._charge(row[1], -row[0])
+        return row is not None
+
+    def _charge(self, backend: str, size: int) -> None:
+        self._db.execute("INSERT INTO totals (backend, bytes) VALUES (?, ?) "
+                         "ON CONFLICT (backend) DO UPDATE SET bytes = bytes + excluded.bytes", (backend, size))
+
+    def rebuild(self, cache_dirs: list) -> int:
+        entries = []
+        for cache_dir in cache_dirs:
+            if not os.path.isdir(cache_dir):
+                continue
+            for f in os.listdir(cache_dir):
+                match = rp.search(self._filename_hash, f)
+                if match:
+                    entries.append((match.group(1).lower(), os.path.relpath(os.path.join(cache_dir, f), self.cache_root)))
+
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cache_index")
+            self._db.executemany("INSERT OR REPLACE INTO cache_index (hash, path) VALUES (?, ?)", entries)
+        return len(entries)
+
+    def keys(self) -> list:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT hash FROM cache_index")]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM cache_index").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import zlib
+from typing import Any, AnyStr
+
+from MagicTypes import SuperTypes, CardTypes, SubTypes
+from ManaCost import ManaCost
+
+
+class ScryfallDataObject(object):
+    """A Scryfall card holding only the fields the renderer reads; the full JSON is kept compressed in .raw"""
+    _fields = ("id", "name", "set", "collector_number", "lang", "layout", "cmc", "colors", "color_identity",
+               "oracle_text", "flavor_text", "power", "toughness", "loyalty", "defense", "rarity", "artist",
+               "image_uris", "card_faces", "frame", "frame_effects", "full_art", "border_color", "produced_mana",
+               "released_at")
+    __slots__ = _fields + ("_mana_cost", "_type_line", "supertypes", "cardtypes", "subtypes", "_raw", "_raw_cache",
+                           "_json_hash")
+
+    def __init__(self, card_json: str | dict) -> None:
+        # Input validation(?)
+        if isinstance(card_json, str):
+            card_json = json.loads(card_json)
+
+        raw = json.dumps(card_json, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+        self._raw = zlib.compress(raw, 1)
+        self._raw_cache = None
+        self._json_hash = None
+
+        for key in self._fields:
+            setattr(self, key, card_json.get(key, None))
+        self.mana_cost = card_json.get("mana_cost", None)
+        self.type_line = card_json.get("type_line", "")
+
+    @property
+    def raw(self) -> dict:
+        # Decompressed on first use only, cards that never leave the slotted fields stay compact
+        if self._raw_cache is None:
+            self._raw_cache = json.loads(zlib.decompress(self._raw))
+        return self._raw_cache
+
+    @property
+    def json_hash(self) -> str:
+        # Identifies this exact card data in the render manifest
+        if self._json_hash is None:
+            self._json_hash = hashlib.md5(zlib.decompress(self._raw)).hexdigest()
+        return self._json_hash
+
+    def __getstate__(self) -> dict:
+        # The decompressed JSON is only a cache, pickled cards (e.g. for render workers) ship the compressed copy
+        return {key: getattr(self, key) for key in self.__slots__ if "_raw_cache" != key}
+
+    def __setstate__(self, state: dict) -> None:
+        for key, value in state.items():
+            object.__setattr__(self, key, value)
+        self._raw_cache = None
+
+    def __getattr__(self, key: str) -> Any:
+        # Only called for fields outside the slots: fall back to the full card JSON
+        if key.startswith("_"):
+            raise AttributeError(key)
+        raw = self.raw
+        if key not in raw:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
+        return raw[key]
+
+    def __getitem__(self, key: str) -> Any:
+        # Lets card objects stand in for raw card dicts, e.g. in download_art(card)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __repr__(self) -> str:
+        return f"ScryfallDataObject({self.name} ({str(self.set).upper()} {self.collector_number}))"
+
+    @property
+    def mana_cost(self):
+        return self._mana_cost
+
+    @mana_cost.setter
+    def mana_cost(self, mana_cost: str | dict):
+        self._mana_cost = ManaCost(mana_cost if mana_cost else {})
+
+    @property
+    def type_line(self) -> str:
+        return self._type_line
+
+    @type_line.setter
+    def type_line(self, type_line: AnyStr) -> None:
+        self._type_line = type_line
+        self.supertypes = SuperTypes.from_type_line(str(type_line))
+        self.cardtypes = CardTypes.from_type_line(str(type_line))
+        self.subtypes = SubTypes(str(type_line))
@@ -0,0 +1,38 @@
+import io
+
+import replus as rp
+from PIL import Image  # pillow
+
+from LRUCache import LRUCache
+
+
+class SymbolAtlas:
+    """Mana and text symbols from a template archive, decoded once and resized once per pixel size."""
+
+    def __init__(self, archive, symbology: dict = None, symbol_dir: str = "symbols",
+                 max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.archive = archive
+        self.symbology = symbology if symbology else {}
+        self.symbol_dir = symbol_dir
+        self._sources = {}
+        self._sized = LRUCache(max_bytes=max_bytes, sizeof=lambda img: img.width * img.height * len(img.getbands()))
+
+    def symbol_file(self, symbol: str) -> str:
+        # [symbology] maps "{W}" to an image name, unmapped symbols fall back to their bare text
+        name = self.symbology.get(symbol, rp.sub(r"/[{}\/]/", "", symbol))
+        return f"{self.symbol_dir}/{name}.png"
+
+    def source(self, symbol: str) -> Image.Image:
+        symbol_file = self.symbol_file(symbol)
+        if symbol_file not in self._sources:
+            with Image.open(io.BytesIO(self.archive.read(symbol_file))) as img:
+                self._sources[symbol_file] = img.convert("RGBA")
+        return self._sources[symbol_file]
+
+    def get(self, symbol: str, size: int | tuple) -> Image.Image:
+        size = (int(size), int(size)) if isinstance(size, (int, float)) else tuple(int(s) for s in size)
+        return self._sized.get_or_create((self.symbol_file(symbol), size),
+                                         lambda: self.source(symbol).resize(size, Image.LANCZOS))
+
+    def stats(self) -> dict:
+        return {**self._sized.stats(), "sources": len(self._sources)}
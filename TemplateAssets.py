@@ -0,0 +1,151 @@
+import io
+import json
+import os
+import shutil
+import threading
+import zipfile
+from typing import AnyStr
+
+import numpy
+from PIL import Image, ImageFont  # pillow
+
+from LRUCache import LRUCache
+
+
+class TemplateAssets:
+    """Template archive contents, decoded once and shared: layer images as RGBA arrays, fonts per size."""
+    _stamp_name = ".template.json"
+    # Shared by every store in the process, keyed on archive path and mtime so edits are never served stale
+    _images = LRUCache(max_bytes=512 * 1024 * 1024)
+    _fonts = LRUCache(max_items=128)
+    # Text measurements belong to one archive, each store keeps its own
+    _text_size_items = 16384
+
+    def __init__(self, archive_path: AnyStr, extract_dir: AnyStr = None) -> None:
+        self.archive_path = archive_path
+        self.extract_dir = extract_dir
+        self._lock = threading.Lock()
+        self._archive = zipfile.ZipFile(archive_path, "r")
+        self._names = set(self._archive.namelist())
+        self._mtime = os.path.getmtime(archive_path)
+        self._font_bytes = {}
+        self._text_sizes = LRUCache(max_items=self._text_size_items)
+        if extract_dir:
+            self._extract()
+
+    @property
+    def mtime(self) -> float:
+        return self._mtime
+
+    # ---- On-disk extraction ---- #
+    def _stamp(self) -> dict:
+        return {"archive": os.path.abspath(self.archive_path), "mtime": self._mtime,
+                "size": os.path.getsize(self.archive_path)}
+
+    def _extracted_current(self) -> bool:
+        try:
+            with open(os.path.join(self.extract_dir, self._stamp_name), "r") as f:
+                return self._stamp() == json.loads(f.read())
+        except (OSError, ValueError):
+            return False
+
+    def _extract(self) -> None:
+        if self._extracted_current():
+            return None
+        # Extract beside the target and swap it in with renames, so other processes never see a partial tree
+        suffix = f"{os.getpid()}.{threading.get_ident()}"
+        temp_dir = f"{self.extract_dir}.{suffix}.tmp"
+        stale_dir = f"{self.extract_dir}.{suffix}.old"
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        with self._lock:
+            self._archive.extractall(temp_dir)
+        with open(os.path.join(temp_dir, self._stamp_name), "w") as f:
+            f.write(json.dumps(self._stamp()))
+
+        if os.path.isdir(self.extract_dir):
+            if self._extracted_current():
+                # Another process finished extracting first
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                return None
+            # Archive changed since the last extraction, decoded arrays included
+            try:
+                os.rename(self.extract_dir, stale_dir)
+            except OSError:
+                pass
+        try:
+            os.rename(temp_dir, self.extract_dir)
+        except OSError:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        shutil.rmtree(stale_dir, ignore_errors=True)
+        return None
+
+    def _extracted(self, member: str) -> str:
+        return os.path.join(self.extract_dir, *member.split("/"))
+
+    # ---- Raw members ---- #
+    def has(self, member: str) -> bool:
+        return member in self._names
+
+    def namelist(self) -> list:
+        return sorted(self._names)
+
+    def read(self, member: str) -> bytes:
+        if self.extract_dir:
+            with open(self._extracted(member), "rb") as f:
+                return f.read()
+        # ZipFile shares one file handle, so reads from several threads take turns
+        with self._lock:
+            return self._archive.read(member)
+
+    def crc(self, member: str) -> int:
+        return self._archive.getinfo(member).CRC
+
+    # ---- Decoded assets ---- #
+    def image(self, member: str) -> numpy.ndarray:
+        return self._images.get_or_create((os.path.abspath(self.archive_path), self._mtime, member),
+                                          lambda: self._decode_image(member))
+
+    def _decode_image(self, member: str) -> numpy.ndarray:
+        if self.extract_dir:
+            decoded = f"{self._extracted(member)}.npy"
+            if not os.path.exists(decoded):
+                # Written aside and renamed into place, other workers may be about to map the same file
+                temp_file = f"{decoded}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(temp_file, "wb") as f:
+                    numpy.save(f, self._decode_rgba(member))
+                os.replace(temp_file, decoded)
+            # Later runs page the decoded pixels in straight from disk
+            return numpy.load(decoded, mmap_mode="r")
+        pixels = self._decode_rgba(member)
+        pixels.flags.writeable = False
+        return pixels
+
+    def _decode_rgba(self, member: str) -> numpy.ndarray:
+        with Image.open(io.BytesIO(self.read(member))) as img:
+            return numpy.asarray(img.convert("RGBA")).copy()
+
+    def font(self, member: str, size: int | float) -> ImageFont.FreeTypeFont:
+        def load() -> ImageFont.FreeTypeFont:
+            if self.extract_dir:
+                fontFace = ImageFont.truetype(self._extracted(member), size)
+            else:
+                if member not in self._font_bytes:
+                    self._font_bytes[member] = self.read(member)
+                fontFace = ImageFont.truetype(io.BytesIO(self._font_bytes[member]), size)
+            fontFace.path = member
+            return fontFace
+        return self._fonts.get_or_create((os.path.abspath(self.archive_path), self._mtime, member, size), load)
+
+    def text_size(self, member: str, size: int | float, text: str) -> tuple[float, int]:
+        def measure() -> tuple[float, int]:
+            fontFace = self.font(member, size)
+            if hasattr(fontFace, "getsize"):
+                return fontFace.getsize(text)
+            # Advance width like getsize had, a bounding box leaves spaces with no width at all
+            left, top, right, bottom = fontFace.getbbox(text)
+            return fontFace.getlength(text), bottom
+        return self._text_sizes.get_or_create((member, size, text), measure)
+
+    def close(self) -> None:
+        with self._lock:
+            self._archive.close()
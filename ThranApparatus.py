@@ -1,5 +1,6 @@
 # STANDARD IMPORTS
 import collections
+import concurrent.futures
 import datetime
 import hashlib
 import inspect
@@ -7,111 +8,124 @@ import json
 import numpy
 import os
 import requests
+import shutil
+import threading
 import time
 import tomllib
-import zipfile
 
 # TYPING
-from typing import AnyStr, Dict, Any, List
+from typing import AnyStr, Callable, Dict, Any, Iterator, List
 
 # NON-STANDARD IMPORTS
 # import tqdm # for progress bar
 import cv2  # opencv-python
+from PIL import Image, ImageDraw, ImageEnhance, ImageFont  # pillow
 
 import replus
 # NOTINVENTEDHERESYNDROME
 import replus as rp
-from MagicTypes import SuperTypes, CardTypes, SubTypes
+from ArtCache import ArtCache
+from CachePolicy import CachePolicy
+import CacheStorage
+from HttpClient import HttpClient
+from Pipeline import Pipeline
+from Compositor import Compositor
+from LayerConditions import LayerConditions
+from LogWriter import LogWriter
+from LRUCache import LRUCache
 from ManaCost import ManaCost
+from RateLimiter import TokenBucket
+from RenderManifest import RenderManifest
+from RenderPool import RenderPool
+from ScryfallBulkData import ScryfallBulkData
+from ScryfallCache import ScryfallCache
+from ScryfallDataObject import ScryfallDataObject
+from SymbolAtlas import SymbolAtlas
+from TemplateAssets import TemplateAssets
 
 DEFAULT_ART_DIRECTORY = f".{os.path.sep}art{os.path.sep}original"
-
-class ScryfallDataObject(object):
-    _mana_cost: ManaCost = None
-    _type_line: str = None
-    supertypes: SuperTypes = None
-    cardtypes: CardTypes = None
-    subtypes: SubTypes = None
-
-    # _types = MagicTypes()
-    def __init__(self, card_json: str | dict) -> None:
-        # Input validation(?)
-        if isinstance(card_json, str):
-            card_json = json.loads(card_json)
-
-        # Set attributes for object
-        """
-            This literally isn't necessary, it was just for making coding easier because
-            typing card.mana_cost was easier to implement than card['mana_cost'] because
-            I'M LAZY
-        """
-        for key, value in card_json.items():
-            setattr(self, key, value)
-
-    @property
-    def mana_cost(self):
-        return self._mana_cost
-
-    @mana_cost.setter
-    def mana_cost(self, mana_cost: str | dict):
-        self._mana_cost = ManaCost(mana_cost)
-
-    @property
-    def type_line(self) -> str:
-        return self._type_line
-
-    @type_line.setter
-    def type_line(self, type_line: AnyStr) -> None:
-        self._type_line = type_line
-        self.supertypes = SuperTypes(str(type_line))
-        self.cardtypes = CardTypes(str(type_line))
-        self.subtypes = SubTypes(str(type_line))
-
+# BT.601 luma weights in OpenCV's BGR channel order
+LUMA_WEIGHTS_BGR = numpy.array([0.114, 0.587, 0.299], dtype=numpy.float32)
 
 class ThranApparatus:
     __version__ = "4.3"
     last_update = "2023-01-18"
-    _last_api_call = 0
+    # Rate limiter shared by all instances and threads (read more here) --> https://scryfall.com/docs/api
+    _rate_limiter = TokenBucket(rate=10)
     _template = None
     _config = None
     _card_list = []
     _card_data = []
+    _card_list_stats = {"lines": 0, "cards": 0, "dupes": 0}
     _card_image = None
+    _symbol_atlas = None
+    _layer_conditions = None
+    _template_assets = None
+    # Stacking order of image layer groups, anything unlisted goes on top
+    _layer_order = ["frame", "borders", "decorations"]
+    _scryfall_cache = None
+    _cache_storage = None
+    _cache_format = "file:json"
+    _cache_policy = None
+    # Per object type TTL overrides in seconds (card, list, mana_cost, error), see CachePolicy.default_ttls
+    _cache_ttls = {}
+    _cache_max_bytes = 1024 ** 3
+    _bulk_data = None
+    _art_cache = None
+    _http = None
+    # Scryfall responses already seen this run, keyed on the normalized URI and capped by their serialized size
+    _rest_memo_bytes = 64 * 1024 ** 2
+    _render_manifest = None
+    _template_fingerprint = None
+    # Bump whenever the art processing changes output, so cached art gets reprocessed
+    _art_pipeline_version = 2
+    _art_cache_bytes = 2 * 1024 ** 3
 
     # Directories
     _dir_art_default = f"./art/default"
+    _dir_cache_scryfall = f"./_cache/scryfall"
     _dir_cache_cards = f"./_cache/scryfall/cards"
     _dir_cache_search = f"./_cache/scryfall/search"
     _dir_cache_mana_cost = f"./_cache/scryfall/mana_cost"
     _dir_cache_err = f"./_cache/scryfall/error"
     _dir_cache_art = f"./_cache/art"
     _dir_cache_text = f"./_cache/text"
+    _dir_cache_templates = f"./_cache/templates"
     _dir_renders = f"./renders"
     _dir_logs = "./logs"
     _dir_templates = "./templates"
+    _bulk_data_file = "./_cache/scryfall/bulk.sqlite"
+    _cache_db_file = "./_cache/scryfall/responses.sqlite"
+    _render_manifest_name = ".manifest.json"
+
+    # Descreen grids and kernels, shared by every image with the same dimensions
+    _descreen_cache = LRUCache(max_bytes=64 * 1024 * 1024)
+    _descreen_buffer_items = 4
 
     # Logging
     _log_file_name = datetime.datetime.now().strftime("%Y-%m-%d_%H%M%S.log")
+    _log_format = "text"
+    _log_writer = None
 
     # ---- Initializations ---- #
     def __init__(self, **kwargs: dict) -> None:
         # self._test()
-        self._art_directory = kwargs.get("art_directory", self._dir_art_default)
-        self._force_overwrite = kwargs.get("force_overwrite", False)
-        self._input = kwargs.get("input", None)
-        self._reminder = kwargs.get("reminder", False)
-        self._template = kwargs.get("template", "classicRedux")
-        self._output = kwargs.get("output", self._dir_renders)
-        self._verbose = kwargs.get("verbose", 0)
-        self._extra_options = kwargs.get("extra_options", [])
+        self._apply_options(**kwargs)
 
         self.show_logo()
         self.make_dirs()
+        self._open_caches()
 
         if self._input:
             print(f"\n========== Loading Template ==========")
             self.load_template(self._template)
 
+        if self._stream:
+            print(f"\n========== Streaming Cards ==========")
+            self.run_pipeline()
+            self.report_rest_stats()
+            return None
+
         print(f"\n========== Parsing Card List ==========")
         if not self.load_card_list(self._input):
             pass
@@ -123,6 +137,57 @@ class ThranApparatus:
         print(f"\n========== Rendering Cards ==========")
         if self._card_list:
             self.render_card_list()
+        self.report_rest_stats()
+
+    def _apply_options(self, **kwargs: dict) -> None:
+        self._options = kwargs
+        self._art_directory = kwargs.get("art_directory", self._dir_art_default)
+        self._force_overwrite = kwargs.get("force_overwrite", False)
+        self._input = kwargs.get("input", None)
+        self._reminder = kwargs.get("reminder", False)
+        self._template = kwargs.get("template", "classicRedux")
+        self._output = kwargs.get("output", self._dir_renders)
+        self._verbose = kwargs.get("verbose", 0)
+        self._extra_options = kwargs.get("extra_options", [])
+        self._threads = max(1, int(kwargs.get("threads", 1)))
+        self._jobs = max(1, int(kwargs.get("jobs", 1)))
+        self._log_format = kwargs.get("log_format", self._log_format)
+        self._log_file_name = kwargs.get("log_file_name", self._log_file_name)
+        self._extract_template = kwargs.get("extract_template", False)
+        self._stream = kwargs.get("stream", False)
+        self._cache_format = kwargs.get("cache_format", self._cache_format)
+
+    @classmethod
+    def render_worker(cls, options: dict) -> "ThranApparatus":
+        # Renderer for a pool process: options, template archive and config only, no pipeline run
+        worker = cls.__new__(cls)
+        worker._apply_options(**options)
+        worker._open_caches()
+        worker.load_template(worker._template)
+        return worker
+
+    def _open_caches(self) -> None:
+        self._scryfall_cache = ScryfallCache(self._fix_dir_sep(self._dir_cache_scryfall))
+        if 0 == self._scryfall_cache.count():
+            # Index existing caches from before the index was introduced
+            self._scryfall_cache.rebuild([self._fix_dir_sep(d) for d in self._scryfall_cache_dirs()])
+        try:
+            self._cache_storage = self._open_cache_storage(self._cache_format, self._scryfall_cache)
+        except ValueError as e:
+            self.kill_err(f"Cache format error [ValueError]:", f"! {e}")
+        self._cache_policy = CachePolicy(self._cache_storage, self._scryfall_cache, self._cache_ttls,
+                                         self._cache_max_bytes)
+        if os.path.exists(self._fix_dir_sep(self._bulk_data_file)):
+            self._bulk_data = ScryfallBulkData(self._fix_dir_sep(self._bulk_data_file))
+        self._art_cache = ArtCache(self._fix_dir_sep(self._dir_cache_art), self._art_cache_bytes)
+        # Scryfall asks for a descriptive User-Agent, the pooled session reuses connections across requests
+        self._http = HttpClient(f"Thran-Apparatus/{self.__version__}")
+        # Sized by the response body where one was read, sizeof only serves responses without one
+        self._rest_memo = LRUCache(max_bytes=self._rest_memo_bytes,
+                                   sizeof=lambda r: len(json.dumps(r, separators=(",", ":"))))
+        self._rest_inflight = {}
+        self._rest_lock = threading.Lock()
+        self._rest_stats = collections.Counter()
 
     def _test(self):
         sda = ScryfallDataObject()
@@ -156,50 +221,146 @@ class ThranApparatus:
 
     # ---- API Facilitation ---- #
     def _make_rest_call(self, endpoint: AnyStr):
+        json_data = self._fetch_page(endpoint)
+
+        # List responses spanning several pages are collected into the first page's data
+        if json_data and self._response_has_more(json_data):
+            pages = self._iter_rest_pages(json_data["next_page"])
+            json_data = {**json_data, "data": list(json_data.get("data", []))}
+            for page in pages:
+                json_data["data"].extend(page.get("data", []))
+            json_data["has_more"] = False
+            json_data.pop("next_page", None)
+
+        return json_data
+
+    def _iter_rest_pages(self, endpoint: AnyStr) -> Iterator[dict]:
+        # One page at a time, each cached on its own, so callers can stop before the rest are downloaded
+        next_page = endpoint
+        while next_page:
+            json_data = self._fetch_page(next_page)
+            if not json_data:
+                return None
+            yield json_data
+            next_page = json_data["next_page"] if self._response_has_more(json_data) else None
+            if next_page:
+                self._verbose_logging(f"List has more data: {next_page}", 0, 2)
+        return None
+
+    def iter_rest_list(self, endpoint: AnyStr) -> Iterator[dict]:
+        for page in self._iter_rest_pages(endpoint):
+            yield from page.get("data", [])
+
+    def _fetch_page(self, endpoint: AnyStr) -> dict | bool:
         # Normalize the endpoint URI
         uri = f"https://api.scryfall.com/{endpoint.replace('https://api.scryfall.com/', '')}"
 
-        # Check for existing json in cache
-        pattern = f"^.*{self._generate_md5_hash(uri)}\\.json$"
-        cached_json = self._check_scryfall_cache(pattern)
-        if isinstance(cached_json, str) and not self._force_overwrite:
-            json_data = self._load_json(cached_json)
+        # Responses are shared between callers, so they're treated as read-only
+        json_data = self._rest_memo.get(uri)
+        if json_data is not None:
+            self._count_rest("memo")
+            return json_data
+
+        # Concurrent callers of the same URI wait on the one fetch already in flight
+        with self._rest_lock:
+            json_data = self._rest_memo.get(uri)
+            future = self._rest_inflight.get(uri) if json_data is None else None
+            owner = json_data is None and future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._rest_inflight[uri] = future
+        if json_data is not None:
+            self._count_rest("memo")
+            return json_data
+        if not owner:
+            self._count_rest("coalesced")
+            return future.result()
+
+        try:
+            json_data, size = self._fetch_uri(uri)
+            if json_data:
+                self._rest_memo.put(uri, json_data, size)
+            future.set_result(json_data)
+            return json_data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._rest_lock:
+                self._rest_inflight.pop(uri, None)
+
+    def _fetch_uri(self, uri: str) -> tuple[dict | bool, int | None]:
+        # The response and the size of its body, None when there is no body to go by
+        uri_hash = self._generate_md5_hash(uri)
+        cached_json, stale = self._check_scryfall_cache(uri_hash)
+        if cached_json is not None and not stale and not self._force_overwrite:
+            self._count_rest("cache")
+            json_data = cached_json
+            size = self._cached_body_size(uri_hash)
         else:
-            # Rate limiter (read more here) --> https://scryfall.com/docs/api
-            t_diff = time.time() - self._last_api_call
-            if 0.1 > t_diff:
-                self._verbose_logging(f"API limit hit ({t_diff}), sleeping for {0.1 - t_diff} seconds", 0, 2)
-                time.sleep(0.1 - t_diff)
-            self._last_api_call = time.time()
-
-            # URI builder
+            # Refreshing a cached entry is a conditional request, unchanged data comes back as an empty 304
+            validators = self._scryfall_cache.validators(uri_hash) if cached_json is not None else {}
             try:
-                response = requests.get(uri)
+                response = self._http.get(uri, throttle=self._throttle, **validators)
+                if 304 == response.status_code and cached_json is not None:
+                    self._verbose_logging(f"Cached Scryfall data is still current: {uri}", 0, 3)
+                    self._cache_policy.refresh(uri_hash)
+                    self._count_rest("revalidated")
+                    return cached_json, self._cached_body_size(uri_hash)
                 json_data = json.loads(response.text)
+                size = len(response.content)
             except Exception as err1:
-                self._verbose_logging(f"{type(err1)} {err1.args[0].__dict__.get('reason', None)}: {uri}", 0, 1)
-                return False
+                self._verbose_logging(f"{type(err1).__name__} {err1}: {uri}", 0, 1)
+                if cached_json is not None:
+                    # Stale beats nothing when Scryfall can't be reached
+                    self._verbose_logging(f"Using stale cached Scryfall data: {uri}", 0, 2)
+                    self._count_rest("stale")
+                    return cached_json, self._cached_body_size(uri_hash)
+                self._count_rest("failed")
+                return False, None
+            self._count_rest("downloaded")
 
             self._save_response_json(uri, json_data)
+            self._scryfall_cache.set_validators(uri_hash, **HttpClient.validators(response))
 
             if 200 != response.status_code or "error" == json_data.get("object", False):
                 self._verbose_logging(f"Error from \"{uri}\" ({response.status_code}): {response.text}", 0, 1)
-                return False
-
-        # There's more data so we have to go deeper
-        if self._response_has_more(json_data):
-            recursed_data = json_data.get("data", [])
-            if json_data.get("has_more", False) and json_data.get("next_page", False):
-                self._verbose_logging(f"List has more data: {json_data['next_page']}", 0, 2)
-                more_json = self._make_rest_call(json_data["next_page"])[0]
-                if isinstance(more_json, dict):
-                    recursed_data += more_json
-            json_data["data"] = recursed_data
+                return False, None
 
         if not isinstance(json_data, dict):
             self.kill_err(f"Type {type(json_data)} returned from {uri}")
 
-        return json_data
+        return json_data, size
+
+    def _cached_body_size(self, uri_hash: str) -> int | None:
+        # Uncompressed JSON on disk weighs about what the response body did, other formats don't say
+        if "json" == self._cache_storage.serializer and "none" == self._cache_storage.compression:
+            return self._cache_storage.size(uri_hash)
+        return None
+
+    def _throttle(self) -> None:
+        # Rate limiter, every attempt at a Scryfall API request (retries included) draws from the bucket
+        waited = self._rate_limiter.acquire()
+        if 0 < waited:
+            self._verbose_logging(f"API limit hit, slept for {waited:.3f} seconds", 0, 2)
+        return None
+
+    def _count_rest(self, source: str) -> None:
+        with self._rest_lock:
+            self._rest_stats[source] += 1
+
+    def report_rest_stats(self) -> dict:
+        with self._rest_lock:
+            stats = dict(self._rest_stats)
+        total = sum(stats.values())
+        if 0 < total:
+            shared = stats.get("memo", 0) + stats.get("coalesced", 0)
+            self._verbose_logging(f"Scryfall requests: {total} total, {stats.get('memo', 0)} memo hits, "
+                                  f"{stats.get('coalesced', 0)} coalesced ({shared / total:.1%} served in memory), "
+                                  f"{stats.get('cache', 0)} from cache, {stats.get('revalidated', 0)} revalidated, "
+                                  f"{stats.get('downloaded', 0)} downloaded, {stats.get('stale', 0)} stale, "
+                                  f"{stats.get('failed', 0)} failed", 0, 3)
+        return stats
 
     def _response_has_more(self, response: dict) -> bool:
         if not "list" == response.get("object", False):
@@ -210,73 +371,186 @@ class ThranApparatus:
             return False
         return True
 
-    def _check_scryfall_cache(self, pattern: AnyStr, search_method: str = "findall") -> str | bool:
-        for cache_dir in [member for member, member_type in inspect.getmembers(self) if member.startswith("_dir_cache")]:
-            cache = getattr(self, cache_dir)
-            for f in os.listdir(cache):
-                if getattr(rp, search_method)(pattern, f):
-                    print(f"pattern: {pattern}")
-                    self._verbose_logging(f"Using cached Scryfall data: {f}", 0, 3)
-                    return self._fix_dir_sep(f"{cache}/{f}")
-        print(f"No matches found in cache for {pattern}")
-        return False
+    def _check_scryfall_cache(self, uri_hash: str) -> tuple[dict | None, bool]:
+        cached_json, stale = self._cache_policy.get(uri_hash)
+        if cached_json is not None and stale:
+            self._verbose_logging(f"Cached Scryfall data is stale, revalidating: {self._cache_storage.name(uri_hash)}", 0, 3)
+        elif cached_json is not None:
+            self._verbose_logging(f"Using cached Scryfall data: {self._cache_storage.name(uri_hash)}", 0, 3)
+        else:
+            self._verbose_logging(f"No matches found in cache for {uri_hash}", 3, 3)
+        return cached_json, stale
+
+    @staticmethod
+    def _scryfall_cache_dirs() -> list:
+        return [ThranApparatus._dir_cache_cards, ThranApparatus._dir_cache_search,
+                ThranApparatus._dir_cache_mana_cost, ThranApparatus._dir_cache_err]
+
+    @staticmethod
+    def _open_cache_storage(cache_format: str, index: ScryfallCache) -> CacheStorage.CacheStorage:
+        backend, serializer, compression = CacheStorage.parse_format(cache_format)
+        if "sqlite" == backend:
+            return CacheStorage.SqliteStorage(ThranApparatus._fix_dir_sep(ThranApparatus._cache_db_file),
+                                              serializer, compression)
+        dirs = {
+            'card': ThranApparatus._fix_dir_sep(ThranApparatus._dir_cache_cards),
+            'mana_cost': ThranApparatus._fix_dir_sep(ThranApparatus._dir_cache_mana_cost),
+            'list': ThranApparatus._fix_dir_sep(ThranApparatus._dir_cache_search),
+            'error': ThranApparatus._fix_dir_sep(ThranApparatus._dir_cache_err),
+        }
+        return CacheStorage.FileStorage(index, dirs, serializer, compression)
+
+    @staticmethod
+    def cache_command(command: str, cache_format: str = None) -> None:
+        cache = ScryfallCache(ThranApparatus._fix_dir_sep(ThranApparatus._dir_cache_scryfall))
+        if "rebuild" == command:
+            print(f"Rebuilding Scryfall cache index...")
+            count = cache.rebuild([ThranApparatus._fix_dir_sep(d) for d in ThranApparatus._scryfall_cache_dirs()])
+            print(f"Indexed {count} cached responses")
+        if "migrate" == command:
+            cache_format = cache_format if cache_format else ThranApparatus._cache_format
+            try:
+                target = ThranApparatus._open_cache_storage(cache_format, cache)
+            except ValueError as e:
+                exit(f"Cache format error: {e}")
+            # Whatever is cached as files or in the SQLite store gets rewritten in the requested format
+            sources = [ThranApparatus._open_cache_storage("file", cache)]
+            if os.path.exists(ThranApparatus._fix_dir_sep(ThranApparatus._cache_db_file)):
+                sources.append(ThranApparatus._open_cache_storage("sqlite", cache))
+            for source in sources:
+                print(f"Migrating {source.count()} cached responses from {source.backend} storage to {target.format}...")
+                count, skipped = CacheStorage.migrate(source, target)
+                print(f"Migrated {count} cached responses" + (f", skipped {skipped} unreadable or unnamed ones"
+                                                              if skipped else ""))
+                if source.backend != target.backend:
+                    source.close()
+            # Sizes change with the format, the size cap has to see the new ones
+            for uri_hash in target.keys():
+                cache.resize(uri_hash, target.size(uri_hash), target.backend)
+            target.close()
+        if command in ["stats", "prune"]:
+            try:
+                storage = ThranApparatus._open_cache_storage(cache_format if cache_format else ThranApparatus._cache_format, cache)
+            except ValueError as e:
+                exit(f"Cache format error: {e}")
+            policy = CachePolicy(storage, cache, ThranApparatus._cache_ttls, ThranApparatus._cache_max_bytes)
+            if "prune" == command:
+                pruned = policy.prune()
+                print(f"Removed {pruned['expired']} expired and {pruned['evicted']} least recently used responses, "
+                      f"{pruned['bytes'] / 1024 ** 2:.1f} MiB freed")
+            stats = policy.stats()
+            print(f"{'type':<12}{'items':>10}{'MiB':>10}{'stale':>10}{'ttl':>12}")
+            for object_type, type_stats in sorted(stats["types"].items(), key=lambda t: str(t[0])):
+                ttl = policy.ttls.get(object_type, policy.default_ttl)
+                print(f"{str(object_type):<12}{type_stats['items']:>10}{type_stats['bytes'] / 1024 ** 2:>10.1f}"
+                      f"{type_stats['stale']:>10}{'never' if ttl is None else f'{ttl / 3600:g}h':>12}")
+            print(f"{stats['items']} cached responses, {stats['bytes'] / 1024 ** 2:.1f} of "
+                  f"{stats['max_bytes'] / 1024 ** 2:.0f} MiB in {storage.format} storage")
+            if stats["untracked"]:
+                print(f"{stats['untracked']} more responses are not tracked yet, prune picks them up")
+            policy.flush()
+            storage.close()
+        cache.close()
+        return None
 
     def _parse_cache_filename(self, uri: str, content: dict):
         hash = self._generate_md5_hash(uri)
         if "card" == content.get("object", False):
-            return f"{content['name']}_{content['set']}_{content['collector_number']}_{content['id']}_{hash}.json"
+            return f"{content['name']}_{content['set']}_{content['collector_number']}_{content['id']}_{hash}"
         if "mana_cost" == content.get("object", False):
-            return rp.sub('/[^A-Z0-9\\-]+/i', '_', content['cost'].replace("/","-")).strip('_') + f"_{hash}.json"
+            return rp.sub('/[^A-Z0-9\\-]+/i', '_', content['cost'].replace("/","-")).strip('_') + f"_{hash}"
         if "error" == content.get("object", False):
-            return f"{content.get('status', 'unknown')}_{hash}.json"
+            return f"{content.get('status', 'unknown')}_{hash}"
         if "list" == content.get("object", False):
-            return rp.sub("/[^\w]+/", "-", uri).strip("-") + f"_{hash}.json"
-        return None
+            return rp.sub("/[^\w]+/", "-", uri).strip("-") + f"_{hash}"
+        return f"{content.get('object', 'unknown')}_{hash}"
 
     def _generate_md5_hash(self, s: AnyStr) -> str:
         return hashlib.md5(str(s).encode('utf-8')).hexdigest()
 
-    def fetch_card_list(self, card_list=None) -> list:
+    def fetch_card_list(self, card_list=None, threads: int = None) -> list:
         card_list = card_list if card_list else self._card_list
-        card_data = []
+        threads = threads if threads else self._threads
 
-        for card in card_list:
-            print(card)
-            c = self.fetch_card(card_name=card['name'], card_set_id=card['set'], card_collector_number=card['num'])
-            if c:
-                card_data.append(c)
+        if 1 < threads:
+            # Executor.map yields results in input order regardless of completion order
+            self._verbose_logging(f"Fetching card data with {threads} threads", 0, 3)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                card_data = [c for c in executor.map(self._fetch_card_entry, card_list) if c]
+        else:
+            card_data = [c for c in map(self._fetch_card_entry, card_list) if c]
 
         self._card_data = card_data
         return card_data
 
+    def _fetch_card_entry(self, card: dict) -> object | None:
+        self._verbose_logging(f"Fetching card entry: {card}", 3, 3)
+        return self.fetch_card(card_name=card['name'], card_set_id=card['set'], card_collector_number=card['num'])
+
     def fetch_card(self, card_name: str = "", card_id: str = "", card_set_id: str = "", card_collector_number: str = "") -> object | None:
         card_json = False
 
-        if card_id:
-            card_json = self._make_rest_call(f"cards/{card_id}")
-        if card_set_id and card_collector_number:
-            card_json = self._make_rest_call(f"cards/{card_set_id}/{card_collector_number}")
-        if card_name:
-            card_json = self._make_rest_call(f"cards/named?exact={card_name.replace(' ', '+')}")
-            if card_set_id and card_json.get("prints_search_uri", False):
-                for card in self._make_rest_call(card_json["prints_search_uri"]).get("data", []):
-                    card_json = card if card_set_id == card.get("set", False) else card_json
-            elif card_json:
-                card_json = card_json[0] if isinstance(card_json, tuple) or isinstance(card_json, list) else card_json
+        if self._bulk_data:
+            card_json = self._fetch_card_bulk(card_name, card_id, card_set_id, card_collector_number)
+
+        if card_json:
+            self._verbose_logging(f"Using local bulk data: {card_json['name']} ({card_json['set'].upper()})", 0, 3)
+        else:
+            if card_id:
+                card_json = self._make_rest_call(f"cards/{card_id}")
+            if card_set_id and card_collector_number:
+                card_json = self._make_rest_call(f"cards/{card_set_id}/{card_collector_number}")
+            if card_name:
+                card_json = self._make_rest_call(f"cards/named?exact={card_name.replace(' ', '+')}")
+                if card_set_id and card_json and card_json.get("prints_search_uri", False):
+                    # Stops paging through the printings as soon as the wanted set turns up
+                    for card in self.iter_rest_list(card_json["prints_search_uri"]):
+                        if card_set_id == card.get("set", False):
+                            card_json = card
+                            break
+                elif card_json:
+                    card_json = card_json[0] if isinstance(card_json, tuple) or isinstance(card_json, list) else card_json
 
         try:
             if not card_json or "card" != card_json.get("object", False):
                 return None
             print(f"card_json ({type(card_json)}): {card_json}")
-            card_json['mana_cost'] = self.parse_mana_cost(card_json['mana_cost']) if card_json['mana_cost'] else card_json['mana_cost']
+            # A copy, the response itself may be shared through the request memo
+            card_json = {**card_json, 'mana_cost': self.parse_mana_cost(card_json['mana_cost']) if card_json.get('mana_cost') else card_json.get('mana_cost')}
             card = ScryfallDataObject(card_json)
             print(card.subtypes, card.cardtypes, card.subtypes, card.mana_cost)
             return card
         except:
             self.kill_err(f"card_json ({type(card_json)}): {card_json}")
 
+    def _fetch_card_bulk(self, card_name: str = "", card_id: str = "", card_set_id: str = "", card_collector_number: str = "") -> dict | None:
+        card_json = None
+        if card_id:
+            card_json = self._bulk_data.by_id(card_id)
+        if not card_json and card_set_id and card_collector_number:
+            card_json = self._bulk_data.by_set_number(card_set_id, card_collector_number)
+        if not card_json and card_name:
+            card_json = self._bulk_data.by_name(card_name, card_set_id)
+        return card_json
+
+    @staticmethod
+    def ingest_bulk_data(file_name: AnyStr) -> int:
+        if not os.path.exists(file_name):
+            raise SystemExit(f"⛔ Missing bulk data file: {file_name}")
+        print(f"Ingesting Scryfall bulk data from {file_name}...")
+        bulk_data = ScryfallBulkData(ThranApparatus._fix_dir_sep(ThranApparatus._bulk_data_file))
+        count = bulk_data.ingest(file_name)
+        print(f"Stored {count} cards ({bulk_data.count()} total in local database)")
+        bulk_data.close()
+        return count
+
     def parse_mana_cost(self, mana_cost: AnyStr) -> dict:
-        return self._make_rest_call(f"https://api.scryfall.com/symbology/parse-mana?cost={mana_cost.strip()}")
+        try:
+            return ManaCost.parse(mana_cost)
+        except ValueError as e:
+            # Unrecognized symbols, let Scryfall have a go at it
+            self._verbose_logging(f"{e}, falling back to Scryfall", 0, 2)
+            return self._make_rest_call(f"https://api.scryfall.com/symbology/parse-mana?cost={mana_cost.strip()}")
 
     def _parse_mana_cost_helper(self, mana_properties: dict) -> dict:
         mana_properties["hybrid"] = True if rp.search("/\{[WUBRG2]/[WUBRG](\/P)?\}/i", mana_properties["cost"]) else False
@@ -297,17 +571,9 @@ class ThranApparatus:
         return json.loads(content)
 
     def _save_response_json(self, uri: str, content: str | dict):
-        cache_grab: dict = {
-            'card': self._dir_cache_cards,
-            'mana_cost': self._dir_cache_mana_cost,
-            'list': self._dir_cache_search,
-            'error': self._dir_cache_err,
-        }
-
         if isinstance(content, str):
             content = json.loads(content)
 
-        target_cache = cache_grab.get(content.get("object"), False)
         filename = self._parse_cache_filename(uri, content)
 
         # Cache logging
@@ -321,9 +587,8 @@ class ThranApparatus:
             self._verbose_logging(f"Adding new error to cache: {content['status']} ({uri})", 0, 2)
 
         try:
-            with open(self._fix_dir_sep(f"{target_cache}/{filename}"), "w") as outfile:
-                outfile.write(json.dumps(content, indent=4))
-                return True
+            self._cache_policy.put(self._generate_md5_hash(uri), filename, content)
+            return True
         except Exception as e:
             self.kill_err(e)
 
@@ -331,7 +596,8 @@ class ThranApparatus:
 
     def kill_err(self, err: str | AnyStr, more: AnyStr = None) -> None:
         msg: str | AnyStr = f"{err}: {more}" if not None == more else err
-        self._add_log(msg)
+        self._add_log(msg, icon=1)
+        self._get_log_writer().flush()
         raise SystemExit(f"⛔ {msg}")
 
     def _verbose_logging(self, msg: str | AnyStr, level: int = 0, icon: int = 0) -> None:
@@ -344,20 +610,33 @@ class ThranApparatus:
         if self._verbose < level:
             return None
         print(f"{icons.get(icon, '')}{msg}")
-        self._add_log(msg)
+        self._add_log(msg, level=level, icon=icon)
         return None
 
-    def _add_log(self, msg: AnyStr) -> None:
+    def _add_log(self, msg: AnyStr, **fields) -> None:
         try:
-            log_file = self._fix_dir_sep(f"{self._dir_logs}/{self._log_file_name}")
-            with open(log_file, mode="a+", encoding="utf-8", newline=str("\n" if str(os.name) == "nt" else "\r\n")) as file_obj:
-                file_obj.write(f"[{self._log_timestamp()}] {msg}{os.linesep}")
+            self._get_log_writer().write(msg, **fields)
         except Exception as e:
-            self.kill_err(e)
+            raise SystemExit(f"⛔ Logging failed: {e}")
         return None
 
-    def _log_timestamp(self) -> str:
-        return str(datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    def _get_log_writer(self) -> LogWriter:
+        # One writer (and one open file handle) per log file for the whole process, forked children get their own
+        if ThranApparatus._log_writer is None or os.getpid() != ThranApparatus._log_writer.pid:
+            ext = "jsonl" if "jsonl" == self._log_format else "log"
+            log_file = self._fix_dir_sep(f"{self._dir_logs}/{os.path.splitext(self._log_file_name)[0]}.{ext}")
+            ThranApparatus._log_writer = LogWriter(log_file, structured="jsonl" == self._log_format)
+        return ThranApparatus._log_writer
+
+    def flush_logs(self) -> None:
+        self._get_log_writer().flush()
+        return None
+
+    def flush_caches(self) -> None:
+        # Batched cache access times, atexit only gets to them in the main process
+        if self._cache_policy:
+            self._cache_policy.flush()
+        return None
 
     # ---- Template Functions ---- #
     @staticmethod
@@ -380,20 +659,34 @@ class ThranApparatus:
         templatePath = self._template_search_caseinsensitive(template)
         if not os.path.exists(templatePath):
             self.kill_err(f"Could not find template: '{templatePath}'")
-        self._template_archive = zipfile.ZipFile(templatePath, 'r')
+        extract_dir = self.unzip_template(templatePath) if self._extract_template else None
+        self._template_assets = TemplateAssets(templatePath, extract_dir)
         self._verbose_logging(f"Template loaded: {templatePath}", 0, 3)
         self.read_config()
 
     def read_config(self) -> None:
         self._verbose_logging("Loading template configuration file...", 0, 3)
         try:
-            self._config = tomllib.load(self._template_archive.open('config.toml'))
+            if not self._template_assets.has('config.toml'):
+                raise KeyError("There is no item named 'config.toml' in the archive")
+            self._config = tomllib.loads(self._template_assets.read('config.toml').decode('utf-8'))
         except tomllib.TOMLDecodeError as e:
             self.kill_err(f"Config parsing error [TOMLDecodeError]:", f"! {e}")
         except KeyError as e:
             self.kill_err(f"Config loading error [KeyError]:", f"! {e}")
+        self._symbol_atlas = SymbolAtlas(self._template_assets, self._config.get("symbology", {}))
+        self._template_fingerprint = None
+        try:
+            self._layer_conditions = LayerConditions(self._config.get("layers", {}))
+        except ValueError as e:
+            self.kill_err(f"Config layer error [ValueError]:", f"! {e}")
         self._verbose_logging("Template configuration loaded!", 0, 0)
 
+    def select_layers(self, card: object, group: str = None) -> list:
+        # Layers whose conditions (and all of their parents' conditions) match the card, in config order
+        layers = self._layer_conditions.select(card)
+        return [layer for layer in layers if group is None or group == layer.path[0]]
+
     # ---- Archive I/O & Directory Functions ---- #
     def make_dirs(self) -> None:
         for n, d in self._get_class_dirs().items():
@@ -407,61 +700,70 @@ class ThranApparatus:
                 dirs[member] = self._fix_dir_sep(value)
         return dirs
 
-    def _fix_dir_sep(self, dir_path: str) -> str:
+    @staticmethod
+    def _fix_dir_sep(dir_path: str) -> str:
         return str(os.path.sep).join(rp.split(r"/[\\/]+/", dir_path))
 
     # ---- Input/Output Functions ---- #
-    def unzip_template(self, template):
-        pass
-
-    def load_card_list(self, file_name: AnyStr) -> list[Any]:
-        # load file
+    def unzip_template(self, template: AnyStr) -> str:
+        # Extracted copies are re-validated against the archive mtime by TemplateAssets
+        template_name = os.path.splitext(os.path.basename(template))[0]
+        return self._fix_dir_sep(f"{self._dir_cache_templates}/{template_name}")
+
+    def iter_card_list(self, file_name: AnyStr) -> Iterator[dict]:
+        # Unique cards in the order they first show up, with the quantities of repeated entries folded in.
+        # The list is parsed in full before the first card goes out, so nothing downstream sees a partial count
         if not os.path.exists(file_name):
             self.kill_err(f"Missing card list file: {file_name}")
 
         self._verbose_logging(f"Reading card list file: {file_name}", 0, 3)
+        regex = rp.compile('/^(\d+x?\s*)?([^(]+)(\(([\w]+)(:(\w+))?)?/i')
+        cards = {}
+        lines = 0
+        dupes = 0
+
         with open(file_name) as f:
-            lines = [line for line in f.readlines() if line.strip()]
+            for line in f:
+                if not line.strip():
+                    continue
+                lines += 1
 
-        # check for cards
-        if 0 >= len(lines):
-            self.kill_err("No cards found in card list file")
+                matches = rp.findall(regex, rp.sub(r'(\[[^\]]+\]|\*[^\*]+\*|#.*$)', '', line).strip())
+                if not matches:
+                    self._verbose_logging(f"No card detected: {line.strip()}", 0, 2)
+                    continue
 
-        self._verbose_logging(f"Found {len(lines)} possible cards in \"{file_name}\"", 0, 3)
+                m = matches[0]
+                card = {}
+                card['name'] = m[1].strip()
+                card['set'] = m[3].strip().lower()
+                card['num'] = m[5].strip().lower()
+                card['qty'] = int(rp.sub(r'/\D/', '', m[0])) if m[0].strip() else 1
+
+                key = (card['name'], card['set'], card['num'])
+                if key in cards:
+                    cards[key]['qty'] += card['qty']
+                    dupes += 1
+                    continue
+                cards[key] = card
 
-        # parse the file
-        self._verbose_logging("Parsing list contents for valid cards.", 0, 3)
-        cards = []
-        regex = rp.compile('/^(\d+x?\s*)?([^(]+)(\(([\w]+)(:(\w+))?)?/i')
-        maxNameLen = 0
-        maxSetLen = 0
-        maxNumLen = 0
+        self._card_list_stats = {"lines": lines, "cards": len(cards), "dupes": dupes}
+        yield from cards.values()
 
-        for line in lines:
-            # print(line)
-            # line = rp.sub(r'(\[[^\]]+\]|\*[^\*]+\*)', '', line).strip()
-            # print(line)
-            matches = rp.findall(regex, rp.sub(r'(\[[^\]]+\]|\*[^\*]+\*|#.*$)', '', line).strip())
-            if not matches:
-                self._verbose_logging(f"No card detected: {line.strip()}", 0, 2)
-                continue
+    def load_card_list(self, file_name: AnyStr) -> list[Any]:
+        cards = list(self.iter_card_list(file_name))
+        stats = self._card_list_stats
+
+        # check for cards
+        if 0 >= stats["lines"]:
+            self.kill_err("No cards found in card list file")
+
+        self._verbose_logging(f"Found {stats['lines']} possible cards in \"{file_name}\"", 0, 3)
 
-            m = matches[0]
-            card = {}
-            card['name'] = m[1].strip()
-            maxNameLen = max(len(card['name']), maxNameLen)
-            card['set'] = m[3].strip().lower()
-            maxSetLen = max(len(card['set']), maxSetLen)
-            card['num'] = m[5].strip().lower()
-            maxNumLen = max(len(card['num']), maxNumLen)
-            cards = cards + [card]
-
-        count = len(cards)
-        if 0 >= count:
+        if 0 >= len(cards):
             self.kill_err("No valid syntax found in cardlist file.")
 
-        cards = [card for n, card in enumerate(cards) if card not in cards[:n]]
-        dupes = count - len(cards)
+        dupes = stats["dupes"]
         if 0 < dupes:
             ent = 'entry' if 1 == dupes else 'entries'
             self._verbose_logging(f"Removed {dupes} duplicate {ent} from card list.", 0, 3)
@@ -469,12 +771,15 @@ class ThranApparatus:
         self._verbose_logging(f"Found {len(cards)} cards in input list", 0, 0)
 
         if 2 <= self._verbose:
-            print("{name:.^{mnl}}.....{set:.^{msl}}.....{num:.^{mul}}".format(
-                name="Card Name", set="Set", num="Col.Num",
+            maxNameLen = max(len(card['name']) for card in cards)
+            maxSetLen = max(len(card['set']) for card in cards)
+            maxNumLen = max(len(card['num']) for card in cards)
+            print("{qty:.^5}{name:.^{mnl}}.....{set:.^{msl}}.....{num:.^{mul}}".format(
+                qty="Qty", name="Card Name", set="Set", num="Col.Num",
                 mnl=maxNameLen, msl=maxSetLen, mul=maxNumLen))
             for card in cards:
-                print("{name:<{mnl}}     {set:<{msl}}     {num:<{mul}}".format(
-                    name=card['name'], set=card['set'], num=card['num'],
+                print("{qty:<5}{name:<{mnl}}     {set:<{msl}}     {num:<{mul}}".format(
+                    qty=card['qty'], name=card['name'], set=card['set'], num=card['num'],
                     mnl=maxNameLen, msl=maxSetLen, mul=maxNumLen))
 
         self._card_list = cards
@@ -599,44 +904,90 @@ class ThranApparatus:
     # ---- Image Processing Functions ---- #
     # Source: https://github.com/6o6o/fft-descreen/blob/master/descreen.py
     # License: MIT License
-    def fft_descreen(self, input, output, threshold: int = 92, radius: int = 6, middle: int = 4):
-        # check for output extension
-        root, ext = os.path.splitext(output)
-        if not ext:
-            ext = '.png'
-        output = root + ext
-
-        #
-        img = numpy.float32(cv2.imread(input).transpose(2, 0, 1))
-        rows, cols = img.shape[-2:]
-        coefs = self.fft_descreen_normalize(rows, cols)
-        mid = middle * 2
+    def fft_descreen(self, input: AnyStr | numpy.ndarray, output: AnyStr = None, threshold: int = 92, radius: int = 6,
+                     middle: int = 4, luminance_mask: bool = False) -> numpy.ndarray:
+        img = input if isinstance(input, numpy.ndarray) else cv2.imread(input)
+        if img is None:
+            self.kill_err(f"Cannot read image to descreen: {input}")
+        rows, cols = img.shape[:2]
+
+        # All three channels go through one stacked FFT using reused float32 buffers
+        channels = self._descreen_buffer("channels", (3, rows, cols), numpy.float32)
+        channels[...] = img.transpose(2, 0, 1)
+        coefs = self._descreen_coefs(rows, cols)
         rad = radius
-        ew, eh = cols // mid, rows // mid
-        pw, ph = (cols - ew * 2) // 2, (rows - eh * 2) // 2
-        middle = numpy.pad(self.fft_descreen_ellipse(ew, eh),
-                           ((ph, rows - ph - eh * 2 - 1),
-                            (pw, cols - pw - ew * 2 - 1)),
-                           'constant')
-
-        for i in range(3):
-            fftimg = cv2.dft(img[i], flags=18)
-            fftimg = numpy.fft.fftshift(fftimg)
-            spectrum = 20 * numpy.log(cv2.magnitude(fftimg[:, :, 0], fftimg[:, :, 1]) * coefs)
-
-            src = numpy.float32(numpy.maximum(0, spectrum))
-            ret, thresh = cv2.threshold(src, threshold, 255, cv2.THRESH_BINARY)
-            thresh *= 1 - middle
-            thresh = cv2.dilate(thresh, self.fft_descreen_ellipse(rad, rad))
-            thresh = cv2.GaussianBlur(thresh, (0, 0), rad / 3., 0, 0, cv2.BORDER_REPLICATE)
-            thresh = 1 - thresh / 255
-
-            img_back = fftimg * numpy.repeat(thresh[..., None], 2, axis=2)
-            img_back = numpy.fft.ifftshift(img_back)
-            img_back = cv2.idft(img_back)
-            img[i] = cv2.magnitude(img_back[:, :, 0], img_back[:, :, 1])
-
-        cv2.imwrite(output, img.transpose(1, 2, 0))
+        middle = self._descreen_middle(rows, cols, middle)
+
+        fftimg = numpy.fft.fftshift(numpy.fft.fft2(channels, axes=(-2, -1)), axes=(-2, -1))
+
+        # Build the notch mask once from the luminance spectrum, or once per channel
+        if luminance_mask:
+            magnitude = numpy.abs(numpy.tensordot(LUMA_WEIGHTS_BGR, fftimg, axes=1))[None]
+        else:
+            magnitude = numpy.abs(fftimg)
+        spectrum = self._descreen_buffer("spectrum", magnitude.shape, numpy.float32)
+        with numpy.errstate(divide="ignore"):
+            numpy.log(magnitude * coefs, out=spectrum, casting="unsafe")
+        spectrum *= 20
+        numpy.maximum(spectrum, 0, out=spectrum)
+
+        thresh = numpy.where(spectrum > threshold, numpy.float32(255), numpy.float32(0))
+        thresh *= 1 - middle
+        # OpenCV filters every plane of a multichannel image in a single call
+        thresh = numpy.ascontiguousarray(thresh.transpose(1, 2, 0))
+        thresh = cv2.dilate(thresh, self._descreen_kernel(rad))
+        thresh = cv2.GaussianBlur(thresh, (0, 0), rad / 3., 0, 0, cv2.BORDER_REPLICATE)
+        thresh = thresh.reshape(rows, cols, -1).transpose(2, 0, 1)
+        thresh = 1 - thresh / 255
+
+        fftimg *= thresh
+        numpy.abs(numpy.fft.ifft2(numpy.fft.ifftshift(fftimg, axes=(-2, -1)), axes=(-2, -1)), out=channels,
+                  casting="unsafe")
+        # Copy out of the shared buffer so the next call can't overwrite the result
+        img = channels.transpose(1, 2, 0).copy()
+
+        if output:
+            # check for output extension
+            root, ext = os.path.splitext(output)
+            if not ext:
+                ext = '.png'
+            cv2.imwrite(root + ext, img)
+        return img
+
+    def _descreen_buffer(self, name: str, shape: tuple, dtype) -> numpy.ndarray:
+        # Per thread, the pipeline's art stage descreens on several threads at once, and only the
+        # most recent image shapes are kept
+        local = self.__dict__.setdefault("_descreen_local", threading.local())
+        if not hasattr(local, "buffers"):
+            local.buffers = LRUCache(max_items=self._descreen_buffer_items)
+        return local.buffers.get_or_create((name, shape, numpy.dtype(dtype).str), lambda: numpy.empty(shape, dtype=dtype))
+
+    def _descreen_coefs(self, rows: int, cols: int) -> numpy.ndarray:
+        # Normalization grid pre-divided by the pixel count to match cv2.DFT_SCALE
+        return self._descreen_cached(("normalize", rows, cols),
+                                     lambda: self.fft_descreen_normalize(rows, cols) / (rows * cols))
+
+    def _descreen_middle(self, rows: int, cols: int, middle: int) -> numpy.ndarray:
+        def build() -> numpy.ndarray:
+            mid = middle * 2
+            ew, eh = cols // mid, rows // mid
+            pw, ph = (cols - ew * 2) // 2, (rows - eh * 2) // 2
+            return numpy.pad(self.fft_descreen_ellipse(ew, eh),
+                             ((ph, rows - ph - eh * 2 - 1),
+                              (pw, cols - pw - ew * 2 - 1)),
+                             'constant')
+        return self._descreen_cached(("middle", rows, cols, middle), build)
+
+    def _descreen_kernel(self, radius: int) -> numpy.ndarray:
+        return self._descreen_cached(("kernel", radius), lambda: self.fft_descreen_ellipse(radius, radius))
+
+    def _descreen_cached(self, key: tuple, build) -> numpy.ndarray:
+        def build_readonly() -> numpy.ndarray:
+            array = build()
+            # Shared between images, so nobody gets to scribble on it
+            array.flags.writeable = False
+            return array
+        return self._descreen_cache.get_or_create(key, build_readonly)
 
     def fft_descreen_normalize(self, h, w):
         x = numpy.arange(w)
@@ -651,11 +1002,15 @@ class ThranApparatus:
         y, x = numpy.ogrid[-h: h + 1., -w: w + 1.]
         return numpy.uint8((x / w) ** 2 + (y / h) ** 2 - offset <= 1)
 
-    def enhance_image(self, input, output, color=1.25, sharpness=3):
-        if not self.file_exists(input):
+    def enhance_image(self, input: AnyStr | numpy.ndarray, output, color=1.25, sharpness=3):
+        if isinstance(input, numpy.ndarray):
+            # In-memory BGR array straight from fft_descreen, skips the PNG round trip
+            pixels = numpy.clip(numpy.rint(input), 0, 255).astype(numpy.uint8)
+            img = Image.fromarray(cv2.cvtColor(pixels, cv2.COLOR_BGR2RGB))
+        elif not os.path.exists(input):
             self.kill_err(f"Cannot find image to enhance: {input}")
-
-        img = Image.open(input)
+        else:
+            img = Image.open(input)
         img = ImageEnhance.Color(img).enhance(color)
         img = ImageEnhance.Sharpness(img).enhance(sharpness)
         img.save(output)
@@ -666,11 +1021,14 @@ class ThranApparatus:
         fullpath = os.path.join(targetDir, filename)
         os.makedirs(targetDir, exist_ok=True)
         if not os.path.exists(fullpath) or forceDownload:
-            data = requests.get(cardJSON['image_uris']['art_crop'], allow_redirects=True)
+            uri = cardJSON['image_uris']['art_crop']
+            # A forced download of art we already have only transfers it again if it changed upstream
+            validators = self._art_cache.validators.get(uri) if os.path.exists(fullpath) else {}
+            data = self._http.download(uri, fullpath, **validators)
             if data.status_code == 200:
-                # print( f"  - Saving {symbol['symbol']}" )
-                with open(fullpath, 'wb') as fh:
-                    fh.write(data.content)
+                self._art_cache.validators.set(uri, **HttpClient.validators(data))
+            elif data.status_code == 304:
+                print(f"- Art unchanged since the last download, using existing file")
             else:
                 print(f"  - Error: status code {data.status_code} for {uri}")
         else:
@@ -678,22 +1036,34 @@ class ThranApparatus:
 
         return fullpath
 
-    def optimize_art(self, cardJSON, forceOptimize=False, threshold=92, radius=6, middle=4, color=1.25, sharpness=1.25):
+    def optimize_art(self, cardJSON, forceOptimize=False, threshold=92, radius=6, middle=4, color=1.25, sharpness=1.25,
+                     luminance=False):
         sourceDir = os.path.join('art', 'default', '_' + cardJSON['set'])
         targetDir = os.path.join('art', 'optimized', '_' + cardJSON['set'])
         filename = cardJSON['image_uris']['art_crop'].split('/')[-1].split('?')[0]
         sourceFull = os.path.join(sourceDir, filename)
         targetFull = os.path.join(targetDir, filename)
         os.makedirs(targetDir, exist_ok=True)
-        if not os.path.exists(targetFull) or forceOptimize:
-            self.fft_descreen(sourceFull, targetFull, threshold, radius, middle)
-            self.enhance_image(targetFull, targetFull, color, sharpness)
-            if not os.path.exists(targetFull):
+
+        params = {"threshold": threshold, "radius": radius, "middle": middle, "color": color,
+                  "sharpness": sharpness, "luminance": luminance}
+        key = self._art_cache.key(self._art_cache.hash_file(sourceFull), params, self._art_pipeline_version)
+        cached = None if forceOptimize else self._art_cache.get(key)
+        if cached:
+            print(f"- Art already optimized with these settings, using cached file")
+        else:
+            cached = self._art_cache.path_for(key, os.path.splitext(filename)[1])
+            start = time.perf_counter()
+            descreened = self.fft_descreen(sourceFull, None, threshold, radius, middle, luminance)
+            descreen_time = time.perf_counter() - start
+            self.enhance_image(descreened, cached, color, sharpness)
+            if not os.path.exists(cached):
                 print("! Something went wrong and the optimized art is now missing")
                 return False
-        else:
-            print(f"- Art already optimized, using existing file")
-            return True
+            timings = {"descreen": round(descreen_time, 4), "enhance": round(time.perf_counter() - start - descreen_time, 4)}
+            self._art_cache.put(key, cached, sourceFull, params, timings)
+
+        shutil.copyfile(cached, targetFull)
         return True
 
     def verify_custom_art(self, art=''):
@@ -710,27 +1080,26 @@ class ThranApparatus:
         return True
 
     # ---- TEXT FUNCTIONS ---- #
-    def wrap_text(self, text, width, height, fontPath, fontSize, lineSpace=0.25, paraSpace=2):
+    def _layout_text(self, text, width, fontPath, fontSize, lineSpace=0.25, paraSpace=2):
         lines = []
         symbols = []
 
         words = text.split(" ")
-        fontFace = ImageFont.truetype(fontPath, fontSize)
-        fontFaceParagraph = ImageFont.truetype(fontPath, int(fontSize / paraSpace))
+        paraSize = int(fontSize / paraSpace)
         line = ""
         totalHeight = 0
 
         for i, word in enumerate(words):
             if "\n" == word:
                 # Newline character, save current line...
-                w, h = fontFace.getsize(line)
+                w, h = self._text_size(fontPath, fontSize, line)
                 lines.append({"line": line, "w": w, "h": h, "size": fontSize, "yOffset": totalHeight})
                 line = ""
                 totalHeight = totalHeight + h
 
                 # ...and add a paragraph break
-                w, h = fontFaceParagraph.getsize(" ")
-                lines.append({"line": " ", "w": w, "h": h, "size": int(fontSize / paraSpace)})
+                w, h = self._text_size(fontPath, paraSize, " ")
+                lines.append({"line": " ", "w": w, "h": h, "size": paraSize})
                 line = ""
                 totalHeight = totalHeight + h
             else:
@@ -747,18 +1116,18 @@ class ThranApparatus:
                         while True:
                             # Add more padding
                             padding = padding + " "
-                            w, h = fontFaceParagraph.getsize(padding)
+                            w, h = self._text_size(fontPath, paraSize, padding)
                             # print( f"padding: '{padding}'" )
                             # If padding threashold has been reached
                             if w >= h:
                                 # Splice padding into word
                                 line = line + word[:location] + padding
-                                xOffset, h = fontFaceParagraph.getsize(padding)
+                                xOffset, h = self._text_size(fontPath, paraSize, padding)
                                 symbols.append({"symbol": sym, "size": h, "yOffset": totalHeight, "xOffset": xOffset})
                                 word = word[location + len(sym):]
                                 break
-                    wOld, h = fontFace.getsize(f"{line} ")
-                    w, h = fontFace.getsize(f"{line} {padding}")
+                    wOld, h = self._text_size(fontPath, fontSize, f"{line} ")
+                    w, h = self._text_size(fontPath, fontSize, f"{line} {padding}")
 
                     if w <= width:
                         line = f"{line} {padding}{word}"
@@ -767,35 +1136,67 @@ class ThranApparatus:
                         totalHeight = totalHeight + h + (lineSpace * fontSize)
                 # print( "symbol" )
                 else:
-                    w, h = fontFace.getsize(f"{line} {word}")
+                    w, h = self._text_size(fontPath, fontSize, f"{line} {word}")
                     # Less than the length, add the word
                     if w <= width:
                         line = f"{line} {word}"
 
                         # End this line
                         if i == len(words) - 1:
-                            w, h = fontFace.getsize(line)
+                            w, h = self._text_size(fontPath, fontSize, line)
                             lines.append({"line": line, "w": w, "h": h, "size": fontSize})
                             totalHeight = totalHeight + h + (lineSpace * fontSize)
                     # This new word pushes it past the limit
                     else:
-                        w, h = fontFace.getsize(line)
+                        w, h = self._text_size(fontPath, fontSize, line)
                         lines.append({"line": line, "w": w, "h": h, "size": fontSize})
                         line = f"{word}"
                         totalHeight = totalHeight + h + (lineSpace * fontSize)
 
+                        # The word that wrapped is also the last one
+                        if i == len(words) - 1:
+                            w, h = self._text_size(fontPath, fontSize, line)
+                            lines.append({"line": line, "w": w, "h": h, "size": fontSize})
+                            totalHeight = totalHeight + h + (lineSpace * fontSize)
+
         # for line in lines:
         #     w, h = fontFace.getsize(f"{line['line']}")
 
         totalHeight = totalHeight - (lineSpace * fontSize)
+        return lines, totalHeight, symbols
+
+    def wrap_text(self, text, width, height, fontPath, fontSize, lineSpace=0.25, paraSpace=2):
+        # Try the requested size first, most text fits as-is
+        lines, totalHeight, symbols = self._layout_text(text, width, fontPath, fontSize, lineSpace, paraSpace)
         if totalHeight > height:
-            # Recursively shrink that font size until you get it right!
-            return self.wrap_text(text, width, height, fontPath, fontSize - 1, lineSpacing, paraSpace)
-        else:
-            print(f"  - Optimum font-size: {fontSize}")
-            print(f"  - Textblock height: {totalHeight}")
-            print(f"  - Total Symbols: {len(symbols)}")
-            return lines, totalHeight, symbols
+            # Binary search how many points to shrink by, same candidate sizes as shrinking one point at a time
+            low, high = 1, max(1, int(numpy.ceil(fontSize)) - 1)
+            smallest = fontSize - high
+            best = None
+            while low <= high:
+                shrink = (low + high) // 2
+                layout = self._layout_text(text, width, fontPath, fontSize - shrink, lineSpace, paraSpace)
+                if layout[1] <= height:
+                    best = (fontSize - shrink, layout)
+                    high = shrink - 1
+                else:
+                    low = shrink + 1
+            if best is None:
+                # Nothing fits, settle for the smallest size
+                best = (smallest, self._layout_text(text, width, fontPath, smallest, lineSpace, paraSpace))
+            fontSize, (lines, totalHeight, symbols) = best
+
+        self._verbose_logging(f"Optimum font-size: {fontSize}, textblock height: {totalHeight}, "
+                              f"total symbols: {len(symbols)}", 2, 3)
+        return lines, totalHeight, symbols
+
+    def _font_face(self, fontPath, fontSize) -> ImageFont.FreeTypeFont:
+        # Template font members, cached by TemplateAssets per archive, mtime and size
+        return self._template_assets.font(fontPath, fontSize)
+
+    def _text_size(self, fontPath, fontSize, text) -> tuple[int, int]:
+        # Word and glyph measurements repeat constantly between layout passes and cards
+        return self._template_assets.text_size(fontPath, fontSize, text)
 
     def wrap_rules_text(self, oracleText, flavorText, width, height, oFont, fFont, fontSize):
         symbols = []
@@ -917,70 +1318,313 @@ class ThranApparatus:
 
         return lines, symbols
 
-    def single_line_kerning(self, text, maxWidth, fontFace, pixelOffset=0):
-        # https://stackoverflow.com/questions/58591305/how-to-set-fonts-kerning-in-python-pillow
-        img = Image.new("RGBA", (maxWidth, 2000))
-        draw = ImageDraw.Draw(img)
-        totalWidth = 0
-        for i, letter in enumerate(text):
-            letterWidth, h = fontFace.getsize(letter)
-            totalWidth = totalWidth + letterWidth - pixelOffset
-            position = (totalWidth - letterWidth, 20)
-            draw.text(position, letter, (255, 255, 255), fontFace)
-        if totalWidth > maxWidth:
-            img = None
-            draw = None
-            print(f"! Type line width of {maxWidth}px exceeded ({totalWidth}): kerning -{pixelOffset}px")
-            return self.single_line_kerning(text, maxWidth, fontFace, pixelOffset + 1)
-        return pixelOffset
+    def single_line_kerning(self, text, maxWidth, fontPath, fontSize, pixelOffset=0):
+        # Every letter gives up the same number of pixels, so the offset that fits is
+        # ceil(overflow / letters), worked out from cached glyph advances instead of test renders
+        if not text:
+            return pixelOffset
+        totalWidth = sum(self._text_size(fontPath, fontSize, letter)[0] for letter in text)
+        overflow = totalWidth - len(text) * pixelOffset - maxWidth
+        if 0 >= overflow:
+            return pixelOffset
+        kerning = pixelOffset + -(-overflow // len(text))
+        self._verbose_logging(f"Line width of {maxWidth}px exceeded ({totalWidth - len(text) * pixelOffset}): "
+                              f"kerning -{kerning}px", 1, 2)
+        return int(kerning)
 
     # ---- Rendering Functions ---- #
+    def render_symbol(self, canvas: Image.Image, symbol: str, size: int, position: tuple) -> None:
+        img = self._symbol_atlas.get(symbol, size)
+        canvas.paste(img, (int(position[0]), int(position[1])), img)
+        return None
+
     def render_card(self, card: object) -> bool:
-        print(inspect.getmembers(card))
-        print(f"card.mana_cost: {card.mana_cost}")
-        print(f"card.cmc: {card.cmc}")
-        print(f"card.mana_cost.colorless: {card.mana_cost.colorless}")
-        print(f"card.mana_cost.monocolored: {card.mana_cost.monocolored}")
-        print(f"card.mana_cost.multicolored: {card.mana_cost.multicolored}")
-        print(f"card.mana_cost.hybrid: {card.mana_cost.hybrid}")
-        print(f"card.mana_cost.phyrexian: {card.mana_cost.phyrexian}")
-        self.kill_err("temporary lock")
-        render_dir = self._output if self._output else self._dir_renders
-        output = self._fix_dir_sep(f"{render_dir}/{card.name}.png")
-        print(self.parse_mana_cost(card.mana_cost))
+        output = self.render_output(card)
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+
+        # Blend the art, frame, border and decoration layers in a single pass
+        art, art_position = self.load_card_art(card)
+        canvas = self.composite_layers(card, art, art_position)
+        if canvas is None:
+            self._verbose_logging(f"No template layers or art to render for {card.name}", 0, 2)
+            return False
+        canvas = self.render_text(card, canvas)
 
+        self._verbose_logging(f"Saving {card.name} to {output}", 1, 0)
+        canvas.save(output, format="png")
         return True
 
-        canvas = None
+    def render_text(self, card: object, canvas: Image.Image) -> Image.Image:
+        # Text layers are named after the card field they print, e.g. [layers.text.standard.type_line]
+        drawing = ImageDraw.Draw(canvas)
+        fonts = self._config.get("fonts", {})
+        for layer in self.select_layers(card, "text"):
+            text = self._text_value(card, layer.path[-1])
+            if text and layer.data.get("font") in fonts:
+                self.draw_text_block(canvas, drawing, layer.data, text)
+        return canvas
 
-        # Create render directory
-        if not self.dir_exists(renderDir):
-            os.makedirs(renderDir)
+    @staticmethod
+    def _text_value(card: object, field: str) -> str:
+        value = getattr(card, field, None)
+        # ManaCost objects print their cost string
+        value = value.cost if hasattr(value, "cost") else value
+        return str(value) if value else ""
+
+    def draw_text_block(self, canvas: Image.Image, drawing: ImageDraw.ImageDraw, block: dict, text: str) -> None:
+        fontPath = self._config["fonts"][block["font"]]
+        width = self._text_block_width(block, canvas)
+        if block.get("kerning", False):
+            return self.draw_text_line(drawing, block, text, width, self._points_to_pixels(block["size"], canvas))
+        lineSpace = block.get("line_space", 0.25)
+        lines, totalHeight, symbols = self.wrap_text(text.replace("\n", " \n "), width, block.get("height", canvas.height),
+                                                     fontPath, self._points_to_pixels(block["size"], canvas), lineSpace)
+        color = self._text_color(block)
+        y = block["y"]
+        for line in lines:
+            fontFace = self._font_face(fontPath, line["size"])
+            drawing.text((self._align_text(block, width, line["w"]), y), line["line"].lstrip(), color, font=fontFace)
+            y += line["h"] + lineSpace * line["size"]
+        for symbol in symbols:
+            if self._template_assets.has(self._symbol_atlas.symbol_file(symbol["symbol"])):
+                self.render_symbol(canvas, symbol["symbol"], symbol["size"],
+                                   (block["x"] + symbol["xOffset"], block["y"] + symbol["yOffset"]))
+        return None
 
-        # Loop through and call all render_layer methods
-        for method in dir(self):
-            if "render_layer" == method[0:12]:
-                layer = getattr(self, method)(card)
-                if canvas is None and layer is not None:
-                    canvas = layer
-                elif canvas is not None and layer is not None:
-                    canvas.alpha_composite(layer, (0, 0))
-                else:
-                    print("- Skipping layer...")
+    def draw_text_line(self, drawing: ImageDraw.ImageDraw, block: dict, text: str, width: float,
+                       fontSize: float) -> None:
+        # Single-line blocks keep their size and tighten the letter spacing instead when they run long
+        fontPath = self._config["fonts"][block["font"]]
+        fontFace = self._font_face(fontPath, fontSize)
+        kerning = self.single_line_kerning(text, width, fontPath, fontSize)
+        advances = [self._text_size(fontPath, fontSize, letter)[0] - kerning for letter in text]
+        x = self._align_text(block, width, sum(advances))
+        color = self._text_color(block)
+        for letter, advance in zip(text, advances):
+            drawing.text((x, block["y"]), letter, color, font=fontFace)
+            x += advance
+        return None
+
+    @staticmethod
+    def _points_to_pixels(size: int | float, canvas: Image.Image) -> float:
+        # Block sizes are in points, templates are drawn at whatever resolution fits a 2.5 inch wide card
+        return size * canvas.width / 2.5 / 72
+
+    @staticmethod
+    def _text_block_width(block: dict, canvas: Image.Image) -> float:
+        # Blocks without a width run from x to the same margin on the right-hand side of the card
+        return block.get("width", canvas.width - 2 * block["x"])
 
-        if canvas is not None:
-            # Render text
-            canvas = template.render_text(card, canvas)
+    @staticmethod
+    def _align_text(block: dict, width: float, textWidth: float) -> float:
+        if "right" == block.get("align", "left"):
+            return block["x"] + width - textWidth
+        if "center" == block.get("align", "left"):
+            return block["x"] + width / 2 - textWidth / 2
+        return block["x"]
+
+    @staticmethod
+    def _text_color(block: dict) -> tuple:
+        return tuple(map(int, str(block.get("color", "0,0,0")).split(",")))
+
+    def render_output(self, card: object) -> str:
+        render_dir = self._output if self._output else self._dir_renders
+        return self._fix_dir_sep(f"{render_dir}/{card.name}.png")
+
+    # ---- Incremental Rendering ---- #
+    def _get_render_manifest(self) -> RenderManifest:
+        if self._render_manifest is None:
+            render_dir = self._output if self._output else self._dir_renders
+            self._render_manifest = RenderManifest(self._fix_dir_sep(f"{render_dir}/{self._render_manifest_name}"))
+        return self._render_manifest
+
+    def _get_template_fingerprint(self) -> str:
+        # The whole parsed config and the CRC of every archive member, any template edit means a new render.
+        # Shared by every card, so it's only hashed once per template and stored as a digest
+        if self._template_fingerprint is None:
+            assets = self._template_assets
+            self._template_fingerprint = RenderManifest.fingerprint({
+                "template": os.path.basename(assets.archive_path),
+                "config": self._config,
+                "members": {m: assets.crc(m) for m in assets.namelist()},
+            })
+        return self._template_fingerprint
+
+    def render_fingerprint(self, card: object) -> tuple[str, dict]:
+        # Call once the card's art is resolved, a missing art file fingerprints differently from the finished one
+        layers = [layer.name for layer in self.select_layers(card)]
+
+        art_file = self.optimized_art_path(card)
+        art = self._art_cache.hash_file(art_file) if art_file and os.path.exists(art_file) else None
+
+        inputs = {
+            "card": card.json_hash,
+            "art": art,
+            "template": self._get_template_fingerprint(),
+            "layers": layers,
+            "options": {"reminder": self._reminder, "extra_options": self._extra_options},
+        }
+        return RenderManifest.fingerprint(inputs), inputs
+
+    def _render_is_current(self, card: object) -> tuple[bool, str, dict]:
+        fingerprint, inputs = self.render_fingerprint(card)
+        if self._force_overwrite:
+            return False, fingerprint, inputs
+        return self._get_render_manifest().is_current(self.render_output(card), fingerprint), fingerprint, inputs
+
+    def optimized_art_path(self, card: object) -> str | None:
+        if not getattr(card, "image_uris", None):
+            return None
+        filename = card.image_uris["art_crop"].split("/")[-1].split("?")[0]
+        return os.path.join("art", "optimized", f"_{card.set}", filename)
+
+    def load_card_art(self, card: object) -> tuple[numpy.ndarray | None, tuple]:
+        # Placement comes from the template's [art] section: x, y and optionally width and height to scale to
+        art_config = self._config.get("art", {})
+        position = (art_config.get("x", 0), art_config.get("y", 0))
+        art_file = self.optimized_art_path(card)
+        if not art_file or not os.path.exists(art_file):
+            return None, position
+        with Image.open(art_file) as img:
+            img = img.convert("RGBA")
+            if art_config.get("width", False) and art_config.get("height", False):
+                img = img.resize((int(art_config["width"]), int(art_config["height"])), Image.LANCZOS)
+            return numpy.asarray(img), position
+
+    def composite_layers(self, card: object, art: numpy.ndarray = None, art_position: tuple = (0, 0)) -> Image.Image | None:
+        layers = [layer for layer in self.select_layers(card) if "image" in layer.data]
+        layers.sort(key=lambda layer: self._layer_order.index(layer.path[0]) if layer.path[0] in self._layer_order
+                    else len(self._layer_order))
+        if not layers and art is None:
+            return None
 
-            print("+ Saving card canvas\n")
-            canvas.save(output, format="png")
+        images = [(self._template_assets.image(layer.data["image"]), layer.data["image"]) for layer in layers]
+        height, width = images[0][0].shape[:2] if images else art.shape[:2]
+
+        # One preallocated canvas per card size, reused from card to card
+        compositors = self.__dict__.setdefault("_compositors", {})
+        if (width, height) not in compositors:
+            compositors[(width, height)] = Compositor(width, height)
+        compositor = compositors[(width, height)]
+        compositor.reset()
+
+        if art is not None:
+            compositor.add(art, art_position)
+        for image, key in images:
+            # Keyed on the archive's mtime as well, so an edited template never reuses stale boxes
+            compositor.add(image, (0, 0), key=(self._template_assets.archive_path, self._template_assets.mtime, key))
+        return Image.fromarray(compositor.result(), "RGBA")
+
+    def run_pipeline(self, file_name: AnyStr = None) -> list:
+        # parse -> fetch -> art -> render, with bounded queues in between so every stage overlaps the others
+        file_name = file_name if file_name else self._input
+        if 1 < self._jobs:
+            options = {**self._options, "log_file_name": self._log_file_name}
+            with RenderPool(self._jobs, ThranApparatus.render_worker, options) as pool:
+                results = self._run_pipeline(file_name, lambda card: pool.render_one(-1, card))
         else:
-            print("! Card failed to render\n")
+            results = self._run_pipeline(file_name, lambda card: self.render_card_entry(-1, card))
+        return results
+
+    def _run_pipeline(self, file_name: AnyStr, render: Callable) -> list:
+        pipeline = Pipeline([
+            ("fetch", self._fetch_card_entry, self._threads),
+            ("art", self._pipeline_art, self._threads),
+            ("render", lambda card: self._pipeline_render(card, render), self._jobs),
+        ])
+        results = pipeline.run(self.iter_card_list(file_name))
+        if self._render_manifest:
+            self._render_manifest.flush()
+        self.flush_caches()
+
+        for stage, stats in pipeline.stats.items():
+            self._verbose_logging(f"{stage}: {stats['in']} in, {stats['out']} out, {stats['dropped']} dropped, "
+                                  f"{len(stats['errors'])} errors", 1, 3)
+            for index, error in stats["errors"]:
+                self._verbose_logging(f"{stage} failed for card list entry {index + 1}: {error}", 0, 1)
+        for index, (name, rendered, error) in results:
+            if error and "skipped" != error:
+                self._verbose_logging(f"Failed to render {name}: {error}", 0, 1)
+
+        failures = len([r for r in results if not r[1][1]])
+        skipped = len([r for r in results if "skipped" == r[1][2]])
+        self._verbose_logging(f"Rendered {len(results) - failures - skipped} of {len(results)} cards, "
+                              f"{skipped} unchanged", 0, 0 if 0 == failures else 2)
+        return results
+
+    def _pipeline_render(self, card: object, render: Callable) -> tuple[str, bool, Any]:
+        current, fingerprint, inputs = self._render_is_current(card)
+        if current:
+            return card.name, True, "skipped"
+        index, rendered, error = render(card)
+        if rendered:
+            self._get_render_manifest().record(self.render_output(card), fingerprint, inputs)
+        return card.name, rendered, error
+
+    def _pipeline_art(self, card: object) -> object:
+        # Art is best effort, a card without it still goes on to render
+        try:
+            self.download_art(card, self._force_overwrite)
+            self.optimize_art(card, self._force_overwrite)
+        except Exception as e:
+            self._verbose_logging(f"Art unavailable for {card.name}: {type(e).__name__}: {e}", 0, 2)
+        return card
+
+    def render_card_entry(self, index: int, card: object) -> tuple[int, bool, Any]:
+        try:
+            return index, bool(self.render_card(card)), None
+        except (Exception, SystemExit) as e:
+            return index, False, f"{type(e).__name__}: {e}"
 
-    def render_card_list(self, card_data=None):
+    def render_card_list(self, card_data=None, jobs: int = None) -> list:
         card_data = self._card_data if not card_data else card_data
-        for card in card_data:
-            self.render_card(card)
+        jobs = jobs if jobs else self._jobs
+
+        # Art comes first, the fingerprints below cover the optimized art files
+        if 1 < self._threads:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self._threads) as executor:
+                card_data = list(executor.map(self._pipeline_art, card_data))
+        else:
+            card_data = [self._pipeline_art(card) for card in card_data]
+
+        # Cards whose data, art, template layers and options are unchanged since their last render are skipped
+        pending = []
+        fingerprints = {}
+        for index, card in enumerate(card_data):
+            current, fingerprint, inputs = self._render_is_current(card)
+            if current:
+                self._verbose_logging(f"{card.name} is unchanged, skipping render", 1, 3)
+                continue
+            fingerprints[index] = (fingerprint, inputs)
+            pending.append((index, card))
+
+        if 1 < jobs and 1 < len(pending):
+            self._verbose_logging(f"Rendering {len(pending)} cards with {jobs} processes", 0, 3)
+            # Workers append to this run's log file instead of starting their own
+            options = {**self._options, "log_file_name": self._log_file_name}
+            results = RenderPool(jobs, ThranApparatus.render_worker, options).render([card for _, card in pending])
+            results = [(pending[i][0], rendered, error) for i, rendered, error in results]
+        else:
+            results = [self.render_card_entry(index, card) for index, card in pending]
+
+        manifest = self._get_render_manifest()
+        for index, rendered, error in results:
+            if rendered:
+                manifest.record(self.render_output(card_data[index]), *fingerprints[index])
+            if error:
+                self._verbose_logging(f"Failed to render {card_data[index].name}: {error}", 0, 1)
+        manifest.flush()
+        self.flush_caches()
+
+        failures = len([r for r in results if not r[1]])
+        self._verbose_logging(f"Rendered {len(results) - failures} of {len(card_data)} cards, "
+                              f"{len(card_data) - len(pending)} unchanged", 0, 0 if 0 == failures else 2)
+        if self._symbol_atlas:
+            stats = self._symbol_atlas.stats()
+            self._verbose_logging(f"Symbol atlas: {stats['hits']} hits, {stats['misses']} misses "
+                                  f"({stats['hit_rate']:.1%}), {stats['sources']} symbols decoded, "
+                                  f"{stats['evictions']} evictions", 1, 3)
+        return results
 
 
 # load cardlist
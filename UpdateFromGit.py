@@ -1,9 +1,10 @@
 from typing import AnyStr, Any
-import requests
 import json
 import os
 import hashlib
 
+from HttpClient import HttpClient
+
 
 class UpdateFromGit:
     updates = {}
@@ -12,13 +13,14 @@ class UpdateFromGit:
         self.uri = uri
         self.script_path = script_path if 0 < len(script_path.strip()) else self._resolve_directory()
         self.allowed_updates = ['replus.py']
+        self.http = HttpClient("Thran-Apparatus-Updater")
 
     def _resolve_directory(self):
         import __main__
         self.script_path = os.path.dirname(os.path.abspath(__main__.__file__))
 
     def check(self, uri: AnyStr = "", target_path: AnyStr = "") -> tuple[bool, dict[Any, Any]]:
-        response = requests.get(uri if 0 < len(uri.strip()) else self.uri)
+        response = self.http.get(uri if 0 < len(uri.strip()) else self.uri)
         target_path = self.script_path if 0 == len(target_path) else target_path
 
         if 200 != response.status_code:
@@ -54,7 +56,7 @@ class UpdateFromGit:
     def save_file(self, url, filepath) -> bool:
         # return True
         print(f"Downloading {filepath} from {url}")
-        response = requests.get(url)
+        response = self.http.get(url)
         if 200 != response.status_code:
             print(f"Update failed: status code {response.status_code} received.")
             return False
@@ -56,6 +56,16 @@ if '__main__' == __name__:
         updater.check()
         exit()
 
+    # Bulk data ingestion
+    if args.bulk_data:
+        ThranApparatus.ingest_bulk_data(args.bulk_data)
+        exit()
+
+    # Cache maintenance
+    if args.cache:
+        ThranApparatus.cache_command(args.cache, args.cache_format)
+        exit()
+
     # Show the script help
     if args.input is None:
         parser.print_help()
@@ -71,5 +81,11 @@ if '__main__' == __name__:
         template=args.template,
         output=args.output,
         verbose=args.verbose,
+        threads=int(args.threads),
+        jobs=int(args.jobs),
+        log_format=args.log_format,
+        extract_template=args.extract_template,
+        stream=args.stream,
+        cache_format=args.cache_format,
         extra_options=args.extra_options
     )
@@ -0,0 +1,96 @@
+"""
+Scryfall cache storage benchmark: write/read throughput and disk usage per cache format.
+
+    python benchmarks/cache_storage.py [count] [--formats file:json sqlite:json:gzip ...]
+
+Formats needing msgpack or zstandard are skipped when those packages aren't installed.
+The legacy row is the old layout: one pretty-printed JSON file per response.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import CacheStorage  # noqa: E402
+from ScryfallCache import ScryfallCache  # noqa: E402
+from card_model import synthetic_card  # noqa: E402
+
+DEFAULT_FORMATS = ["file:json", "file:json:gzip", "file:msgpack:zstd", "sqlite:json", "sqlite:json:gzip",
+                   "sqlite:msgpack", "sqlite:msgpack:zstd"]
+
+
+def disk_usage(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def open_storage(cache_format: str, root: str) -> CacheStorage.CacheStorage:
+    backend, serializer, compression = CacheStorage.parse_format(cache_format)
+    if "sqlite" == backend:
+        return CacheStorage.SqliteStorage(os.path.join(root, "responses.sqlite"), serializer, compression)
+    dirs = {kind: os.path.join(root, kind) for kind in ["card", "list", "mana_cost", "error"]}
+    return CacheStorage.FileStorage(ScryfallCache(root), dirs, serializer, compression)
+
+
+def bench_legacy(cards: list, root: str) -> tuple[float, float]:
+    os.makedirs(os.path.join(root, "card"))
+    start = time.perf_counter()
+    for uri_hash, card in cards:
+        with open(os.path.join(root, "card", f"{card['name']}_{uri_hash}.json"), "w") as f:
+            f.write(json.dumps(card, indent=4))
+    write = time.perf_counter() - start
+    start = time.perf_counter()
+    for uri_hash, card in cards:
+        with open(os.path.join(root, "card", f"{card['name']}_{uri_hash}.json"), "r") as f:
+            json.loads(f.read())
+    return write, time.perf_counter() - start
+
+
+def bench_storage(cards: list, cache_format: str, root: str) -> tuple[float, float]:
+    storage = open_storage(cache_format, root)
+    start = time.perf_counter()
+    for uri_hash, card in cards:
+        storage.put(uri_hash, f"{card['name']}_{uri_hash}", card)
+    write = time.perf_counter() - start
+    start = time.perf_counter()
+    for uri_hash, _ in cards:
+        storage.get(uri_hash)
+    read = time.perf_counter() - start
+    storage.close()
+    return write, read
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Scryfall cache storage formats")
+    parser.add_argument("count", nargs="?", type=int, default=5000)
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS)
+    args = parser.parse_args()
+
+    cards = [(f"{n:032x}", synthetic_card(n)) for n in range(args.count)]
+    payload = sum(len(json.dumps(card)) for _, card in cards) / 1024 ** 2
+
+    print(f"{args.count} cards, {payload:.1f} MiB of compact JSON")
+    print(f"{'format':<24}{'write/s':>10}{'read/s':>10}{'write MiB/s':>13}{'read MiB/s':>12}{'disk MiB':>10}")
+    for cache_format in ["legacy"] + args.formats:
+        root = tempfile.mkdtemp(prefix="cache_bench_")
+        try:
+            if "legacy" == cache_format:
+                write, read = bench_legacy(cards, root)
+            else:
+                write, read = bench_storage(cards, cache_format, root)
+        except ValueError as e:
+            print(f"{cache_format:<24}skipped: {e}")
+            continue
+        finally:
+            size = disk_usage(root) / 1024 ** 2
+            shutil.rmtree(root)
+        print(f"{cache_format:<24}{args.count / write:>10.0f}{args.count / read:>10.0f}"
+              f"{payload / write:>13.1f}{payload / read:>12.1f}{size:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Card loading benchmark: time and memory to build ScryfallDataObject instances.
+
+    python benchmarks/card_model.py [count] [--bulk ./_cache/scryfall/bulk.sqlite]
+
+Cards come from the local bulk data store when one is given, otherwise a synthetic
+card shaped like a full Scryfall response is repeated with unique ids and names.
+Each card is built from its JSON text, the way cached responses are loaded. Field reads are timed
+as well: slotted fields, a field only held in the compressed JSON (first and repeated reads) and
+the card hash used by the render manifest.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ScryfallBulkData import ScryfallBulkData  # noqa: E402
+from ScryfallDataObject import ScryfallDataObject  # noqa: E402
+
+FORMATS = ["standard", "future", "historic", "gladiator", "pioneer", "explorer", "modern", "legacy", "pauper",
+           "vintage", "penny", "commander", "oathbreaker", "brawl", "historicbrawl", "alchemy", "paupercommander",
+           "duel", "oldschool", "premodern", "predh"]
+
+
+def synthetic_card(n: int) -> dict:
+    card_id = str(uuid.UUID(int=n))
+    return {
+        "object": "card", "id": card_id, "oracle_id": card_id, "multiverse_ids": [n], "mtgo_id": n,
+        "tcgplayer_id": n, "cardmarket_id": n, "name": f"Llanowar Elves {n}", "lang": "en",
+        "released_at": "2018-04-27", "uri": f"https://api.scryfall.com/cards/{card_id}",
+        "scryfall_uri": f"https://scryfall.com/card/dom/{n}/llanowar-elves", "layout": "normal",
+        "highres_image": True, "image_status": "highres_scan",
+        "image_uris": {size: f"https://cards.scryfall.io/{size}/front/{card_id}.jpg?1562744015"
+                       for size in ["small", "normal", "large", "png", "art_crop", "border_crop"]},
+        "mana_cost": {"object": "mana_cost", "cost": "{G}", "colors": ["G"], "cmc": 1.0, "colorless": False,
+                      "monocolored": True, "multicolored": False},
+        "cmc": 1.0, "type_line": "Creature — Elf Druid", "oracle_text": "{T}: Add {G}.",
+        "flavor_text": "One bone broken for every twig snapped underfoot.", "power": "1", "toughness": "1",
+        "colors": ["G"], "color_identity": ["G"], "keywords": [], "produced_mana": ["G"],
+        "legalities": {f: "legal" for f in FORMATS}, "games": ["arena", "paper", "mtgo"], "reserved": False,
+        "foil": True, "nonfoil": True, "finishes": ["nonfoil", "foil"], "oversized": False, "promo": False,
+        "reprint": True, "variation": False, "set_id": str(uuid.UUID(int=n + 1)), "set": "dom",
+        "set_name": "Dominaria", "set_type": "expansion", "set_uri": "https://api.scryfall.com/sets/dom",
+        "set_search_uri": "https://api.scryfall.com/cards/search?order=set&q=e%3Adom&unique=prints",
+        "scryfall_set_uri": "https://scryfall.com/sets/dom", "rulings_uri": "https://api.scryfall.com/rulings",
+        "prints_search_uri": "https://api.scryfall.com/cards/search?order=released&q=oracleid&unique=prints",
+        "collector_number": str(n), "digital": False, "rarity": "common", "card_back_id": card_id,
+        "artist": "Chris Rahn", "artist_ids": [card_id], "illustration_id": card_id, "border_color": "black",
+        "frame": "2015", "full_art": False, "textless": False, "booster": True, "story_spotlight": False,
+        "edhrec_rank": 10, "penny_rank": 20,
+        "prices": {"usd": "0.25", "usd_foil": "1.50", "usd_etched": None, "eur": "0.20", "eur_foil": "1.00",
+                   "tix": "0.03"},
+        "related_uris": {k: f"https://example.invalid/{k}/{n}" for k in ["gatherer", "tcgplayer_infinite_articles",
+                                                                          "tcgplayer_infinite_decks", "edhrec"]},
+        "purchase_uris": {k: f"https://example.invalid/{k}/{n}" for k in ["tcgplayer", "cardmarket", "cardhoarder"]},
+    }
+
+
+def load_cards(count: int, bulk: str = None) -> list:
+    if bulk:
+        store = ScryfallBulkData(bulk)
+        with store._lock:
+            rows = store._db.execute("SELECT id FROM cards LIMIT ?", (count,)).fetchall()
+        return [store.by_id(row[0]) for row in rows]
+    return [synthetic_card(n) for n in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark card model construction")
+    parser.add_argument("count", nargs="?", type=int, default=20000)
+    parser.add_argument("--bulk", default=None, help="bulk data sqlite file to read cards from")
+    args = parser.parse_args()
+
+    cards = [json.dumps(card) for card in load_cards(args.count, args.bulk)]
+
+    # Timed and measured in separate passes, tracemalloc slows allocation down considerably
+    start = time.perf_counter()
+    objects = [ScryfallDataObject(card) for card in cards]
+    elapsed = time.perf_counter() - start
+    del objects
+
+    tracemalloc.start()
+    objects = [ScryfallDataObject(card) for card in cards]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Reads the way LayerConditions and the renderer make them
+    reads = {
+        "slotted": lambda card: (card.name, card.colors, card.type_line, card.mana_cost, card.image_uris),
+        "raw first": lambda card: card.legalities,
+        "raw again": lambda card: card.legalities,
+        "json_hash": lambda card: card.json_hash,
+    }
+    timings = {}
+    for label, read in reads.items():
+        start = time.perf_counter()
+        for card in objects:
+            read(card)
+        timings[label] = time.perf_counter() - start
+
+    per_card = lambda seconds: f"{seconds:.3f}s ({seconds / max(1, len(objects)) * 1e6:.1f}us per card)"
+    print(f"cards:      {len(objects)}")
+    print(f"build time: {per_card(elapsed)}")
+    print(f"retained:   {current / 1024 ** 2:.1f} MiB ({current / max(1, len(objects)):.0f} bytes per card)")
+    print(f"peak:       {peak / 1024 ** 2:.1f} MiB")
+    for label, seconds in timings.items():
+        print(f"{label + ':':<12}{per_card(seconds)}")
+
+
+if __name__ == "__main__":
+    main()
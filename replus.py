@@ -1,3 +1,4 @@
+import functools
 import re
 from typing import Iterator, Match, Any, AnyStr, Pattern
 
@@ -11,14 +12,25 @@ re_flags = {
     "x": re.VERBOSE
 }
 
+_cache_size = 512
+
 
 # SPECIALTY INTERNAL FUNCTIONS
 
 def _parse_regex(pattern: Pattern[AnyStr], pre_flags: int = re.NOFLAG) -> Pattern[Any] | Pattern[str | Any]:
-    if not re.fullmatch(r"^\/(.*)\/([\w]*)$", f"{pattern}"):
+    # Already compiled, nothing left to parse
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile_regex(pattern, pre_flags)
+
+
+@functools.lru_cache(maxsize=_cache_size)
+def _compile_regex(pattern: AnyStr, pre_flags: int = re.NOFLAG) -> Pattern[Any] | Pattern[str | Any]:
+    delimited = re.fullmatch(r"^\/(.*)\/([\w]*)$", f"{pattern}")
+    if not delimited:
         return re.compile(pattern, pre_flags)
 
-    pattern, flags = re.fullmatch(r"^\/(.*)\/([\w]*)$", f"{pattern}").groups()
+    pattern, flags = delimited.groups()
     flags = _parse_flags(flags, pre_flags)
 
     return re.compile(pattern, flags)
@@ -34,6 +46,17 @@ def _parse_flags(flags: str = "", pre_flags: int = re.NOFLAG) -> int:
     return parsed_flags
 
 
+# PATTERN CACHE
+
+def cache_info() -> functools._CacheInfo:
+    return _compile_regex.cache_info()
+
+
+def purge() -> None:
+    _compile_regex.cache_clear()
+    re.purge()
+
+
 # UPDATED RE FUNCTIONS USING COMPILED REGEX
 
 def compile(pattern: AnyStr | Pattern[AnyStr], flags: int = re.NOFLAG) -> re.Pattern:
@@ -41,32 +64,32 @@ def compile(pattern: AnyStr | Pattern[AnyStr], flags: int = re.NOFLAG) -> re.Pat
 
 
 def search(pattern: AnyStr | Pattern[AnyStr], string: str, flags: int = re.NOFLAG) -> Match[bytes] | None | Match[str]:
-    return re.search(_parse_regex(pattern, flags), string)
+    return _parse_regex(pattern, flags).search(string)
 
 
 def match(pattern: AnyStr | Pattern[AnyStr], string: str, flags: int = re.NOFLAG) -> Match[bytes] | None | Match[str]:
-    return re.match(_parse_regex(pattern, flags), string)
+    return _parse_regex(pattern, flags).match(string)
 
 
 def fullmatch(pattern: AnyStr | Pattern[AnyStr], string: str, flags: int = re.NOFLAG) -> Match[bytes] | None | Match[str]:
-    return re.fullmatch(_parse_regex(pattern, flags), string)
+    return _parse_regex(pattern, flags).fullmatch(string)
 
 
 def split(pattern: AnyStr | Pattern[AnyStr], string: str, maxsplit: int = 0, flags: int = re.NOFLAG) -> list[bytes | Any] | list[str | Any]:
-    return re.split(_parse_regex(pattern, flags), string, maxsplit, flags)
+    return _parse_regex(pattern, flags).split(string, maxsplit)
 
 
 def findall(pattern: AnyStr | Pattern[AnyStr], string: object, flags: int = re.NOFLAG) -> list[Any]:
-    return re.findall(_parse_regex(pattern, flags), string)
+    return _parse_regex(pattern, flags).findall(string)
 
 
 def finditer(pattern: AnyStr | Pattern[AnyStr], string, flags: int = re.NOFLAG) -> Iterator[Match[bytes]] | Iterator[Match[str]]:
-    return re.finditer(_parse_regex(pattern, flags), string)
+    return _parse_regex(pattern, flags).finditer(string)
 
 
 def sub(pattern: AnyStr | Pattern[AnyStr], repl, string, count: int = 0, flags: int = re.NOFLAG) -> AnyStr:
-    return re.sub(_parse_regex(pattern, flags), repl, string, count)
+    return _parse_regex(pattern, flags).sub(repl, string, count)
 
 
 def subn(pattern: AnyStr | Pattern[AnyStr], repl, string, count: int = 0, flags: int = re.NOFLAG) -> tuple[bytes, int] | tuple[str, int]:
-    return re.subn(_parse_regex(pattern, flags), repl, string, count)
+    return _parse_regex(pattern, flags).subn(repl, string, count)
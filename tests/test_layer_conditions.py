@@ -0,0 +1,32 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from LayerConditions import LayerConditions  # noqa: E402
+
+LAYERS = {
+    "frame": {
+        "png": {"conditions": {"has_image_uris": ["png"]}, "image": "png.png"},
+        "legal": {"conditions": {"not_legalities": ["banned"]}, "image": "legal.png"},
+        "green": {"conditions": {"has_colors": ["g"], "len_colors_lt": 3}, "image": "green.png"},
+    },
+}
+
+
+def names(layers) -> list:
+    return [layer.name for layer in layers]
+
+
+def test_dict_valued_field_evaluates():
+    conditions = LayerConditions(LAYERS)
+    card = {"colors": ["G"], "image_uris": {"png": "https://cards.scryfall.io/png/front/x.png"},
+            "legalities": {"modern": "legal", "vintage": "restricted"}}
+    assert ["frame.png", "frame.legal", "frame.green"] == names(conditions.select(card))
+
+
+def test_dict_valued_field_mismatch():
+    conditions = LayerConditions(LAYERS)
+    card = {"colors": ["W", "U", "B"], "image_uris": {"small": "https://cards.scryfall.io/small/front/x.jpg"},
+            "legalities": {"modern": "banned"}}
+    assert [] == names(conditions.select(card))
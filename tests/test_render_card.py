@@ -0,0 +1,80 @@
+import io
+import os
+import sys
+import types
+import zipfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+numpy = pytest.importorskip("numpy")
+Image = pytest.importorskip("PIL.Image")
+pytest.importorskip("cv2")
+pytest.importorskip("requests")
+
+from TemplateAssets import TemplateAssets  # noqa: E402
+from ThranApparatus import ThranApparatus  # noqa: E402
+
+CONFIG = """
+[art]
+x=2
+y=2
+
+[layers.frame.base]
+image="frame.png"
+"""
+
+
+def png_bytes(pixels: numpy.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, "RGBA").save(buffer, format="png")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def apparatus(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Opaque red frame with a transparent 4x4 window for the art
+    frame = numpy.zeros((8, 8, 4), dtype=numpy.uint8)
+    frame[...] = (255, 0, 0, 255)
+    frame[2:6, 2:6] = 0
+    with zipfile.ZipFile(tmp_path / "test.zip", "w") as archive:
+        archive.writestr("config.toml", CONFIG)
+        archive.writestr("frame.png", png_bytes(frame))
+
+    art = numpy.zeros((4, 4, 4), dtype=numpy.uint8)
+    art[...] = (0, 0, 255, 255)
+    os.makedirs(tmp_path / "art" / "optimized" / "_tst")
+    Image.fromarray(art, "RGBA").save(tmp_path / "art" / "optimized" / "_tst" / "art.png")
+
+    ta = ThranApparatus.__new__(ThranApparatus)
+    ta._apply_options(output=str(tmp_path / "renders"), verbose=-1)
+    ta._template_assets = TemplateAssets(str(tmp_path / "test.zip"))
+    ta.read_config()
+    return ta
+
+
+def card(**fields) -> types.SimpleNamespace:
+    return types.SimpleNamespace(**{"name": "Test Card", "set": "tst", "colors": [], "type_line": "Creature",
+                                    "image_uris": {"art_crop": "https://cards.scryfall.io/art_crop/art.png?1"},
+                                    **fields})
+
+
+def test_render_card_composites_art_under_frame(apparatus):
+    subject = card()
+    assert apparatus.render_card(subject)
+    with Image.open(apparatus.render_output(subject)) as img:
+        pixels = numpy.asarray(img.convert("RGBA"))
+    assert (8, 8, 4) == pixels.shape
+    assert (255, 0, 0, 255) == tuple(pixels[0, 0])
+    assert (0, 0, 255, 255) == tuple(pixels[4, 4])
+
+
+def test_render_card_without_art_keeps_window_transparent(apparatus):
+    subject = card(image_uris=None)
+    assert apparatus.render_card(subject)
+    with Image.open(apparatus.render_output(subject)) as img:
+        pixels = numpy.asarray(img.convert("RGBA"))
+    assert 0 == pixels[4, 4, 3]
+    assert (255, 0, 0, 255) == tuple(pixels[7, 7])